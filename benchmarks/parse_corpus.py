@@ -0,0 +1,98 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+sys.path.insert(0, ROOT)
+
+from bs4.builder import builder_registry
+from src.race_parser import RaceParser
+
+def load_corpus(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        expected_path = os.path.splitext(path)[0] + ".json"
+        expected = None
+        if os.path.exists(expected_path):
+            with open(expected_path, 'r', encoding='utf-8') as f:
+                expected = json.load(f)
+        pages.append((os.path.basename(path), text, expected_path, expected))
+    return pages
+
+def parse(backend, text):
+    RaceParser.backend = backend
+    return RaceParser.extract_participants(text, False)
+
+def first_difference(expected, actual):
+    for index, (want, got) in enumerate(zip(expected, actual)):
+        if want != got:
+            return f"participant {index + 1}: expected {want}, got {got}"
+    return f"expected {len(expected)} participants, got {len(actual)}"
+
+def check(backend, pages):
+    failures = []
+    for name, text, _, expected in pages:
+        actual = parse(backend, text)
+        if expected is None:
+            failures.append((name, "no expected output, run with --update"))
+        elif actual != expected:
+            failures.append((name, first_difference(expected, actual)))
+    return failures
+
+def throughput(backend, pages, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for _, text, _, _ in pages:
+            parse(backend, text)
+    return rounds * len(pages) / (time.perf_counter() - started)
+
+def update(pages):
+    for name, text, expected_path, _ in pages:
+        with open(expected_path, 'w', encoding='utf-8') as f:
+            json.dump(parse("html.parser", text), f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"wrote {os.path.basename(expected_path)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Check parser output against a golden page corpus and measure throughput")
+    parser.add_argument("backends", nargs="*", metavar="BACKEND",
+                        help=f"BeautifulSoup tree builders to run (default: {', '.join(RaceParser.BACKENDS)})")
+    parser.add_argument("--corpus", default=CORPUS, help="directory of *.html pages with expected *.json output")
+    parser.add_argument("--rounds", type=int, default=20, help="passes over the corpus when timing")
+    parser.add_argument("--update", action="store_true", help="rewrite expected output using html.parser")
+    args = parser.parse_args()
+    for backend in args.backends:
+        if backend not in RaceParser.BACKENDS:
+            parser.error(f"unknown backend {backend}, expected one of: {', '.join(RaceParser.BACKENDS)}")
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        raise SystemExit(f"No pages in {args.corpus}")
+
+    if args.update:
+        update(pages)
+        return
+
+    mismatched = False
+    for backend in args.backends or RaceParser.BACKENDS:
+        if builder_registry.lookup(backend) is None:
+            print(f"{backend:<12} not installed")
+            continue
+
+        failures = check(backend, pages)
+        rate = throughput(backend, pages, args.rounds)
+        print(f"{backend:<12} {len(pages) - len(failures)}/{len(pages)} pages match  {rate:8.1f} pages/s")
+        for name, reason in failures:
+            print(f"  {name}: {reason}")
+        mismatched = mismatched or bool(failures)
+
+    sys.exit(1 if mismatched else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    'parser': "import src.race_parser",
+    'api': "import src.api.main",
+    'cli': "import src.cli",
+    'gui': "import src.race_app",
+    'window': (
+        "from src.race_app import RaceApp\n"
+        "app = RaceApp()\n"
+        "app.update()\n"
+        "app.destroy()"
+    )
+}
+
+HEAVY_MODULES = ("tkinter", "matplotlib", "numpy", "openpyxl", "fastapi")
+
+def measure(code, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+def loaded_heavy_modules(code):
+    probe = code + f"\nimport sys\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, check=True, capture_output=True, text=True)
+    return result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ""
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start time of the parser, API and GUI")
+    parser.add_argument("targets", nargs="*", metavar="TARGET",
+                        help=f"entry points to measure: {', '.join(TARGETS)} (default: parser api cli gui)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, help="fail if any target takes longer, in seconds")
+    args = parser.parse_args()
+    for target in args.targets:
+        if target not in TARGETS:
+            parser.error(f"unknown target {target}, expected one of: {', '.join(TARGETS)}")
+    targets = args.targets or ["parser", "api", "cli", "gui"]
+
+    baseline = measure("pass", args.runs)
+    print(f"{'interpreter':<10} {baseline * 1000:8.1f} ms")
+
+    over_budget = False
+    for target in targets:
+        elapsed = measure(TARGETS[target], args.runs) - baseline
+        heavy = loaded_heavy_modules(TARGETS[target]) if target != 'window' else ""
+        print(f"{target:<10} {elapsed * 1000:8.1f} ms  {heavy}")
+        if args.budget is not None and elapsed > args.budget:
+            over_budget = True
+
+    sys.exit(1 if over_budget else 0)
+
+if __name__ == "__main__":
+    main()
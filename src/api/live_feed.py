@@ -0,0 +1,104 @@
+import asyncio
+from src.race_parser import RaceParser
+from src.race_cache import RaceCache
+from src.race_diff import RaceDiff
+from src.tracing import trace_logger
+
+class LiveFeed:
+    QUEUE_SIZE = 32
+
+    def __init__(self, race_type, year, identifier, interval, cache=None, store=None, debug=False):
+        self.race_type = race_type
+        self.year = year
+        self.identifier = identifier
+        self.interval = interval
+        self.cache = cache
+        self.store = store
+        self.debug = debug
+        self.logger = trace_logger()
+        self.snapshot = None
+        self.subscribers = set()
+        self.task = None
+
+    def snapshot_event(self):
+        return {'type': 'snapshot', 'participants': self.snapshot}
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        if self.snapshot is not None:
+            queue.put_nowait(self.snapshot_event())
+
+        self.subscribers.add(queue)
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+        if not self.subscribers and self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def publish(self, event):
+        for queue in list(self.subscribers):
+            if queue.full():
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self.snapshot_event())
+            else:
+                queue.put_nowait(event)
+
+    async def poll(self):
+        participants = await RaceParser.crawl_race(
+            self.race_type, self.year, self.identifier, self.debug, cache=self.cache
+        )
+        if self.store is not None:
+            self.store.add(self.store.race_key(self.race_type, self.year, self.identifier), participants)
+
+        if self.snapshot is None:
+            self.snapshot = participants
+            self.publish(self.snapshot_event())
+            return
+
+        delta = RaceDiff.diff(self.snapshot, participants)
+        self.snapshot = participants
+        if not RaceDiff.is_empty(delta):
+            self.publish({'type': 'delta', **delta})
+
+    async def run(self):
+        while True:
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(
+                    "Live feed error for %s %s %s: %s", self.race_type, self.year, self.identifier, e,
+                    exc_info=self.debug
+                )
+                self.publish({'type': 'error', 'detail': str(e)})
+            await asyncio.sleep(self.interval)
+
+class LiveFeedHub:
+    def __init__(self, interval, cache=None, store=None, debug=False):
+        self.interval = interval
+        self.cache = cache
+        self.store = store
+        self.debug = debug
+        self.feeds = {}
+
+    def subscribe(self, race_type, year, identifier):
+        key = RaceCache.make_key(race_type, year, identifier)
+        feed = self.feeds.get(key)
+        if feed is None:
+            feed = LiveFeed(race_type, year, identifier, self.interval, self.cache, self.store, self.debug)
+            self.feeds[key] = feed
+        return key, feed.subscribe()
+
+    def unsubscribe(self, key, queue):
+        feed = self.feeds.get(key)
+        if feed is None:
+            return
+        feed.unsubscribe(queue)
+        if not feed.subscribers:
+            del self.feeds[key]
@@ -1,7 +1,20 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
 from src.race_parser import RaceParser
+from src.race_cache import RaceCache
+from src.api.prewarm import PrewarmScheduler
+from src.api.live_feed import LiveFeedHub
+from src.api.responses import json_response, select_participants
+from src.snapshot_store import SnapshotStore
+from src.season import METRICS, SeasonAggregator, collect_season, season_races
+from src.tracing import LogHook, ProfileStore
 
 app = FastAPI(
     title="ThroneButt Parser API",
@@ -10,12 +23,43 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+race_cache = RaceCache(
+    ttl=int(os.environ.get("CACHE_TTL", "300")),
+    max_entries=int(os.environ.get("CACHE_SIZE", "256"))
+)
+prewarm = PrewarmScheduler(race_cache, int(os.environ.get("PREWARM_INTERVAL", "0")))
+snapshot_store = SnapshotStore(os.environ["SNAPSHOT_DB"]) if os.environ.get("SNAPSHOT_DB") else None
+live_feeds = LiveFeedHub(int(os.environ.get("LIVE_INTERVAL", "60")), cache=race_cache, store=snapshot_store)
+profiles = ProfileStore()
+season_results = OrderedDict()
+SEASON_RESULTS_LIMIT = 32
+
+trace_sample_rate = float(os.environ.get("TRACE_SAMPLE_RATE", "0"))
+if trace_sample_rate > 0:
+    RaceParser.tracer.add_hook(LogHook(sample_rate=trace_sample_rate))
+
 class Participant(BaseModel):
     rank: str
     name: str
     distance: str
     kills: str
 
+class SeasonPlayer(BaseModel):
+    rank: int
+    name: str
+    races: int
+    total_kills: float
+    best_kills: float
+    total_distance: int
+    best_distance: int
+
+class SeasonParams(BaseModel):
+    race_type: str = Field("daily")
+    year: str = Field(...)
+    month: Optional[int] = Field(None, ge=1, le=12)
+    metric: str = Field("total_kills")
+    top: int = Field(100, ge=1)
+
 class RaceParams(BaseModel):
     race_type: str = Field(...)
     year: str = Field(...)
@@ -23,9 +67,55 @@ class RaceParams(BaseModel):
     page: str = Field("1")
     debug: bool = Field(False)
     all_pages: bool = Field(False)
+    profile: bool = Field(False)
+    offset: int = Field(0, ge=0)
+    limit: Optional[int] = Field(None, ge=1)
+    min_rank: Optional[int] = Field(None, ge=1)
+    max_rank: Optional[int] = Field(None, ge=1)
+
+def live_race(race_type, year, identifier):
+    if year is None or identifier is None:
+        for current in PrewarmScheduler.current_races():
+            if current[0] == race_type:
+                return current
+        raise HTTPException(status_code=400, detail=f"Unknown race type: {race_type}")
+
+    if race_type == "daily":
+        if "/" not in identifier:
+            raise HTTPException(status_code=400, detail="Daily identifier must be month/day")
+        month, day = identifier.split('/')
+        return race_type, year, (month, day)
+    return race_type, year, identifier
+
+@app.on_event("startup")
+async def start_prewarm():
+    prewarm.start()
+
+@app.on_event("shutdown")
+async def stop_prewarm():
+    await prewarm.stop()
 
 @app.post("/parse", response_model=List[Participant])
-async def parse_race(params: RaceParams):
+async def parse_race(params: RaceParams, request: Request):
+    headers = {}
+    if not params.profile:
+        participants = await run_parse(params)
+    else:
+        async with profiles.capture() as capture:
+            headers["X-Profile-Id"] = capture.report_id
+            participants = await run_parse(params)
+
+    participants, total = select_participants(
+        participants or [],
+        params.offset,
+        params.limit,
+        params.min_rank,
+        params.max_rank
+    )
+    headers["X-Total-Count"] = str(total)
+    return json_response(request, participants, headers)
+
+async def run_parse(params):
     try:
         if params.race_type == "daily" and "/" not in params.identifier:
             raise HTTPException(
@@ -38,27 +128,26 @@ async def parse_race(params: RaceParams):
         else:
             identifier = params.identifier
         
+        key = race_cache.make_key(params.race_type, params.year, identifier)
+
         if params.all_pages:
-            participants = []
-            current_page = 1
-            
-            while True:
-                page_data = await RaceParser.parse_race(
+            participants = race_cache.get(key)
+            if participants is None:
+                participants = await RaceParser.crawl_race(
                     params.race_type,
                     params.year,
                     identifier,
-                    str(current_page),
-                    params.debug
+                    params.debug,
+                    cache=race_cache
                 )
-                
-                if not page_data:
-                    break
-                
-                participants.extend(page_data)
-                current_page += 1
-            
             return participants
         else:
+            if race_cache.is_fresh(key):
+                RaceParser.metrics.cache_lookups.inc(cache="result", result="hit")
+                cached = race_cache.get_page(key, params.page)
+                return cached[1] if cached else []
+
+            RaceParser.metrics.cache_lookups.inc(cache="result", result="miss")
             return await RaceParser.parse_race(
                 params.race_type,
                 params.year,
@@ -73,6 +162,121 @@ async def parse_race(params: RaceParams):
             detail=f"Error: {str(e)}"
         )
 
+@app.post("/season", response_model=List[SeasonPlayer])
+async def season_rankings(params: SeasonParams, response: Response):
+    if params.metric not in METRICS:
+        raise HTTPException(status_code=400, detail=f"Unknown metric, expected one of: {', '.join(METRICS)}")
+
+    key = (params.race_type, params.year, params.month, params.metric, params.top)
+    stored = season_results.get(key)
+    if stored is None or time.time() - stored[0] >= race_cache.ttl:
+        try:
+            races = list(season_races(params.race_type, params.year, params.month))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid season: {str(e)}")
+
+        with SeasonAggregator() as aggregator:
+            failed = await collect_season(aggregator, races, cache=race_cache)
+            rankings = await asyncio.to_thread(aggregator.rankings, params.metric, params.top)
+
+        if races and failed == len(races):
+            raise HTTPException(status_code=502, detail=f"All {failed} races failed to load")
+
+        stored = (time.time(), rankings, failed, len(races))
+        season_results[key] = stored
+        season_results.move_to_end(key)
+        while len(season_results) > SEASON_RESULTS_LIMIT:
+            season_results.popitem(last=False)
+
+    _, rankings, failed, races = stored
+    response.headers["X-Season-Races"] = str(races)
+    response.headers["X-Failed-Races"] = str(failed)
+    return rankings
+
+def history_race(race_type, year, identifier):
+    if snapshot_store is None:
+        raise HTTPException(status_code=404, detail="Snapshot history is disabled, set SNAPSHOT_DB")
+    return SnapshotStore.race_key(*live_race(race_type, year, identifier))
+
+@app.get("/live/snapshot", response_model=List[Participant])
+def live_snapshot(race_type: str = "daily", year: Optional[str] = None, identifier: Optional[str] = None, at: Optional[float] = None):
+    race = history_race(race_type, year, identifier)
+    taken_at, participants = snapshot_store.rebuild(race, at)
+    if taken_at is None:
+        raise HTTPException(status_code=404, detail="No snapshot recorded")
+    return participants
+
+@app.get("/live/history")
+def live_history(name: str, race_type: str = "daily", year: Optional[str] = None, identifier: Optional[str] = None):
+    race = history_race(race_type, year, identifier)
+    return snapshot_store.player_history(race, name)
+
+@app.get("/profiles/{report_id}", response_class=PlainTextResponse)
+def get_profile(report_id: str):
+    report = profiles.get(report_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(report)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(
+        RaceParser.metrics.render(),
+        media_type="text/plain; version=0.0.4"
+    )
+
 @app.get("/health")
 def health_check():
     return {"status": "ok", "message": "API works"}
+
+@app.get("/live/sse")
+async def live_sse(race_type: str = "daily", year: Optional[str] = None, identifier: Optional[str] = None):
+    race = live_race(race_type, year, identifier)
+
+    async def stream():
+        key, queue = live_feeds.subscribe(*race)
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+        finally:
+            live_feeds.unsubscribe(key, queue)
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+@app.websocket("/live/ws")
+async def live_ws(websocket: WebSocket, race_type: str = "daily", year: Optional[str] = None, identifier: Optional[str] = None):
+    try:
+        race = live_race(race_type, year, identifier)
+    except HTTPException as e:
+        await websocket.close(code=1008, reason=e.detail)
+        return
+
+    await websocket.accept()
+    key, queue = live_feeds.subscribe(*race)
+
+    async def wait_disconnect():
+        while (await websocket.receive())['type'] != 'websocket.disconnect':
+            pass
+
+    disconnected = asyncio.create_task(wait_disconnect())
+    try:
+        while True:
+            event = asyncio.create_task(queue.get())
+            done, _ = await asyncio.wait({event, disconnected}, timeout=15, return_when=asyncio.FIRST_COMPLETED)
+            if event not in done:
+                event.cancel()
+                if disconnected in done:
+                    break
+                await websocket.send_json({"type": "keepalive"})
+                continue
+            await websocket.send_json(event.result())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        live_feeds.unsubscribe(key, queue)
@@ -0,0 +1,49 @@
+import asyncio
+import datetime
+from src.race_parser import RaceParser
+from src.tracing import trace_logger
+
+class PrewarmScheduler:
+    def __init__(self, cache, interval, debug=False):
+        self.cache = cache
+        self.interval = interval
+        self.debug = debug
+        self.logger = trace_logger()
+        self.task = None
+
+    @staticmethod
+    def current_races(today=None):
+        today = today or datetime.date.today()
+        iso_year, week, _ = today.isocalendar()
+        return [
+            ("daily", str(today.year), (f"{today.month:02d}", f"{today.day:02d}")),
+            ("weekly", str(iso_year), str(week))
+        ]
+
+    async def refresh(self):
+        for race_type, year, identifier in self.current_races():
+            try:
+                await RaceParser.crawl_race(race_type, year, identifier, self.debug, cache=self.cache)
+            except Exception as e:
+                self.logger.warning(
+                    "Prewarm error for %s %s %s: %s", race_type, year, identifier, e, exc_info=self.debug
+                )
+
+    async def run(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self.task is None and self.interval > 0:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
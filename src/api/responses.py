@@ -0,0 +1,77 @@
+import gzip
+import json
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+def dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def accepted_encodings(header):
+    encodings = {}
+    for part in (header or "").split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            encodings[name.lower()] = quality
+    return encodings
+
+def choose_encoding(header):
+    encodings = accepted_encodings(header)
+    if brotli is not None and encodings.get('br', 0) > 0:
+        return 'br'
+    if encodings.get('gzip', encodings.get('*', 0)) > 0:
+        return 'gzip'
+    return None
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+def json_response(request, data, headers=None):
+    body = dumps(data)
+    headers = {'Vary': 'Accept-Encoding', **(headers or {})}
+
+    encoding = choose_encoding(request.headers.get('accept-encoding')) if len(body) >= MIN_COMPRESS_SIZE else None
+    if encoding:
+        body = compress(body, encoding)
+        headers['Content-Encoding'] = encoding
+
+    return Response(body, media_type="application/json", headers=headers)
+
+def rank_number(participant):
+    rank = participant['rank']
+    return int(rank) if rank.isdigit() else None
+
+def select_participants(participants, offset=0, limit=None, min_rank=None, max_rank=None):
+    if min_rank is not None or max_rank is not None:
+        participants = [
+            participant for participant in participants
+            if (rank := rank_number(participant)) is not None
+            and (min_rank is None or rank >= min_rank)
+            and (max_rank is None or rank <= max_rank)
+        ]
+    total = len(participants)
+    end = None if limit is None else offset + limit
+    return participants[offset:end], total
@@ -0,0 +1,379 @@
+import argparse
+import asyncio
+import csv
+import datetime
+import json
+import os
+import sys
+import time
+from src.crawl_queue import CrawlQueue, run_workers
+from src.page_archive import PageArchive
+from src.race_parser import PartialRaceError, RaceParser
+from src.season import METRICS, SeasonAggregator, collect_queue_season, collect_season
+
+FIELDS = ['race_type', 'year', 'race', 'rank', 'name', 'distance', 'kills']
+REPARSE_FIELDS = ['url', 'fetched_at', 'rank', 'name', 'distance', 'kills']
+SEASON_FIELDS = ['rank', 'name', 'races', 'total_kills', 'best_kills', 'total_distance', 'best_distance']
+
+def parse_range(value, parse_one, expected):
+    start, _, end = value.partition('..')
+    try:
+        start, end = parse_one(start), parse_one(end or start)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected {expected}, got {value!r}")
+    if end < start:
+        raise argparse.ArgumentTypeError(f"range ends before it starts: {value!r}")
+    return start, end
+
+def positive_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value!r}")
+    return number
+
+def daily_range(value):
+    return parse_range(value, datetime.date.fromisoformat, "YYYY-MM-DD[..YYYY-MM-DD]")
+
+def weekly_range(value):
+    def parse_week(text):
+        year, week = text.split('/')
+        return datetime.date.fromisocalendar(int(year), int(week), 1)
+
+    return parse_range(value, parse_week, "YEAR/WEEK[..YEAR/WEEK]")
+
+def daily_races(value):
+    start, end = value
+    day = start
+    while day <= end:
+        yield "daily", str(day.year), (f"{day.month:02d}", f"{day.day:02d}")
+        day += datetime.timedelta(days=1)
+
+def timestamp(value):
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected unix time or ISO date/time, got {value!r}")
+
+def weekly_races(value):
+    start, end = value
+    monday = start
+    while monday <= end:
+        year, week, _ = monday.isocalendar()
+        yield "weekly", str(year), str(week)
+        monday += datetime.timedelta(weeks=1)
+
+def race_label(race_type, year, identifier):
+    return f"{race_type} {year}/{identifier if isinstance(identifier, str) else '/'.join(identifier)}"
+
+def race_rows(race_type, year, identifier, participants):
+    race = identifier if isinstance(identifier, str) else "/".join(identifier)
+    for participant in participants:
+        yield {'race_type': race_type, 'year': year, 'race': race, **participant}
+
+class NdjsonWriter:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, rows):
+        for row in rows:
+            self.stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+class CsvWriter:
+    def __init__(self, stream, fields):
+        self.stream = stream
+        self.writer = csv.DictWriter(stream, fieldnames=fields)
+        self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+class XlsxWriter:
+    def __init__(self, path, fields):
+        import openpyxl
+
+        self.path = path
+        self.fields = fields
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet("Participants")
+        self.sheet.append(fields)
+
+    def write(self, rows):
+        for row in rows:
+            self.sheet.append([row[field] for field in self.fields])
+
+    def close(self):
+        self.workbook.save(self.path)
+
+def open_writer(output_format, output, fields=FIELDS):
+    if output_format == "xlsx":
+        if output is None:
+            raise SystemExit("XLSX output requires --output")
+        return XlsxWriter(output, fields), None
+
+    stream = open(output, 'w', newline='', encoding='utf-8') if output else sys.stdout
+    writer = CsvWriter(stream, fields) if output_format == "csv" else NdjsonWriter(stream)
+    return writer, stream if output else None
+
+async def scrape_race(race, semaphore, debug):
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            participants = await RaceParser.crawl_race(*race, debug)
+            return race, participants, None, time.perf_counter() - started
+        except PartialRaceError as e:
+            return race, e.participants, e, time.perf_counter() - started
+        except Exception as e:
+            return race, [], e, time.perf_counter() - started
+
+async def scrape(races, writer, concurrency, debug, progress):
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [asyncio.create_task(scrape_race(race, semaphore, debug)) for race in races]
+    summary = {'races': len(tasks), 'participants': 0, 'partial': 0, 'failed': 0}
+
+    for done, task in enumerate(asyncio.as_completed(tasks), 1):
+        race, participants, error, elapsed = await task
+        writer.write(race_rows(*race, participants))
+        summary['participants'] += len(participants)
+
+        status = f"{len(participants)} participants"
+        if isinstance(error, PartialRaceError):
+            summary['partial'] += 1
+            status += f", partial: {error}"
+        elif error is not None:
+            summary['failed'] += 1
+            status = f"failed: {error}"
+
+        if progress:
+            print(f"[{done}/{len(tasks)}] {race_label(*race)}: {status} ({elapsed:.1f}s)", file=sys.stderr)
+
+    return summary
+
+def selected_races(args):
+    races = [race for value in args.daily for race in daily_races(value)]
+    races += [race for value in args.weekly for race in weekly_races(value)]
+    if not races:
+        raise SystemExit("No races selected: pass --daily and/or --weekly")
+    return races
+
+def run_scrape(args):
+    races = selected_races(args)
+
+    if args.record and args.replay:
+        raise SystemExit("--record and --replay are mutually exclusive")
+    if args.replay_before is not None and not args.replay:
+        raise SystemExit("--replay-before requires --replay")
+    if args.record or args.replay:
+        RaceParser.archive = open_archive(args.record or args.replay, create=bool(args.record))
+        RaceParser.replay = bool(args.replay)
+        RaceParser.replay_before = args.replay_before
+    RaceParser.backend = args.backend
+
+    writer, stream = open_writer(args.format, args.output)
+    started = time.perf_counter()
+    try:
+        summary = asyncio.run(scrape(races, writer, args.concurrency, args.debug, not args.quiet))
+        writer.close()
+    finally:
+        if stream:
+            stream.close()
+    elapsed = time.perf_counter() - started
+
+    metrics = RaceParser.metrics.summary()
+    print(
+        f"{summary['races']} races, {summary['participants']} participants, "
+        f"{summary['partial']} partial, {summary['failed']} failed in {elapsed:.1f}s "
+        f"({metrics['requests']} requests, {metrics['retries']} retries, "
+        f"avg fetch {metrics['fetch_ms']:.0f} ms, avg parse {metrics['parse_ms']:.1f} ms)",
+        file=sys.stderr
+    )
+    return 1 if summary['partial'] or summary['failed'] else 0
+
+def open_archive(path, create=False):
+    try:
+        return PageArchive(path, create)
+    except FileNotFoundError as e:
+        raise SystemExit(str(e))
+
+def run_reparse(args):
+    archive = open_archive(args.archive)
+    writer, stream = open_writer(args.format, args.output, REPARSE_FIELDS)
+    started = time.perf_counter()
+    pages = participants = 0
+    try:
+        for entry, page_participants in archive.reparse(args.url_prefix, args.latest, args.processes):
+            writer.write(
+                {'url': entry['url'], 'fetched_at': entry['fetched_at'], **participant}
+                for participant in page_participants
+            )
+            pages += 1
+            participants += len(page_participants)
+        writer.close()
+    finally:
+        if stream:
+            stream.close()
+    elapsed = time.perf_counter() - started
+
+    rate = pages / elapsed if elapsed else 0
+    print(f"{pages} pages, {participants} participants in {elapsed:.1f}s ({rate:.0f} pages/s)", file=sys.stderr)
+    return 0
+
+def run_enqueue(args):
+    queue = CrawlQueue(args.queue)
+    added = queue.enqueue(selected_races(args))
+    print(f"{added} races added to {args.queue}", file=sys.stderr)
+    queue.close()
+    return 0
+
+def run_work(args):
+    started = time.perf_counter()
+    exit_codes = run_workers(args.queue, args.processes, args.tasks, args.debug)
+    elapsed = time.perf_counter() - started
+
+    queue = CrawlQueue(args.queue)
+    status = queue.status()
+    queue.close()
+    print(
+        f"{args.processes} workers finished in {elapsed:.1f}s: "
+        + ", ".join(f"{count} {state}" for state, count in sorted(status.items())),
+        file=sys.stderr
+    )
+    return 1 if any(exit_codes) or status.get('failed') else 0
+
+def run_queue_status(args):
+    queue = CrawlQueue(args.queue)
+    for state, count in sorted(queue.status().items()):
+        print(f"{state}: {count}")
+    queue.close()
+    return 0
+
+def run_export(args):
+    queue = CrawlQueue(args.queue)
+    writer, stream = open_writer(args.format, args.output)
+    try:
+        writer.write(queue.results())
+        writer.close()
+    finally:
+        if stream:
+            stream.close()
+        queue.close()
+    return 0
+
+def run_season(args):
+    started = time.perf_counter()
+    failed = 0
+
+    def progress(done, total):
+        if not args.quiet:
+            print(f"[{done}/{total}] races collected", file=sys.stderr)
+
+    with SeasonAggregator() as aggregator:
+        if args.queue:
+            queue = CrawlQueue(args.queue)
+            collect_queue_season(aggregator, queue)
+            queue.close()
+        else:
+            failed = asyncio.run(collect_season(aggregator, selected_races(args), args.concurrency, args.debug, progress=progress))
+
+        writer, stream = open_writer(args.format, args.output, SEASON_FIELDS)
+        try:
+            rankings = aggregator.rankings(args.metric, args.top)
+            writer.write(rankings)
+            writer.close()
+        finally:
+            if stream:
+                stream.close()
+
+        races = aggregator.races
+
+    elapsed = time.perf_counter() - started
+    print(f"{races} races, {len(rankings)} players ranked, {failed} races failed in {elapsed:.1f}s", file=sys.stderr)
+    return 1 if failed else 0
+
+def add_race_arguments(parser):
+    parser.add_argument("--daily", action="append", default=[], type=daily_range, metavar="DATE[..DATE]",
+                        help="daily race or inclusive range, e.g. 2025-06-01..2025-06-07")
+    parser.add_argument("--weekly", action="append", default=[], type=weekly_range, metavar="YEAR/WEEK[..YEAR/WEEK]",
+                        help="weekly race or inclusive range, e.g. 2025/20..2025/24")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Headless ThroneButt race scraper")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scrape_parser = commands.add_parser("scrape", help="crawl races and export participants")
+    add_race_arguments(scrape_parser)
+    scrape_parser.add_argument("--format", choices=["ndjson", "csv", "xlsx"], default="ndjson")
+    scrape_parser.add_argument("--output", "-o", help="output file (default: stdout)")
+    scrape_parser.add_argument("--concurrency", "-j", type=positive_int, default=4, help="races crawled in parallel")
+    scrape_parser.add_argument("--quiet", "-q", action="store_true", help="no per-race progress")
+    scrape_parser.add_argument("--record", metavar="ARCHIVE", help="store fetched page HTML in an archive directory")
+    scrape_parser.add_argument("--replay", metavar="ARCHIVE", help="parse pages from an archive instead of the network")
+    scrape_parser.add_argument("--replay-before", type=timestamp, metavar="TIMESTAMP",
+                               help="replay the newest capture fetched at or before this unix time or ISO date/time")
+    scrape_parser.add_argument("--backend", choices=RaceParser.BACKENDS, default=RaceParser.backend,
+                               help="BeautifulSoup tree builder (lxml and html5lib must be installed)")
+    scrape_parser.add_argument("--debug", action="store_true")
+    scrape_parser.set_defaults(handler=run_scrape)
+
+    reparse_parser = commands.add_parser("reparse", help="re-parse every archived page on all cores")
+    reparse_parser.add_argument("archive", help="archive directory written by scrape --record")
+    reparse_parser.add_argument("--url-prefix", default="", help="only pages whose URL starts with this")
+    reparse_parser.add_argument("--latest", action="store_true", help="only the newest capture of each URL")
+    reparse_parser.add_argument("--format", choices=["ndjson", "csv", "xlsx"], default="ndjson")
+    reparse_parser.add_argument("--output", "-o", help="output file (default: stdout)")
+    reparse_parser.add_argument("--processes", "-j", type=positive_int, help="worker processes (default: all cores)")
+    reparse_parser.set_defaults(handler=run_reparse)
+
+    enqueue_parser = commands.add_parser("enqueue", help="add races to a shared crawl queue")
+    enqueue_parser.add_argument("queue", help="SQLite queue file")
+    add_race_arguments(enqueue_parser)
+    enqueue_parser.set_defaults(handler=run_enqueue)
+
+    work_parser = commands.add_parser("work", help="run worker processes until the queue is drained")
+    work_parser.add_argument("queue", help="SQLite queue file")
+    work_parser.add_argument("--processes", "-p", type=positive_int, default=os.cpu_count() or 1)
+    work_parser.add_argument("--tasks", "-t", type=positive_int, default=2, help="concurrent pages per process")
+    work_parser.add_argument("--debug", action="store_true")
+    work_parser.set_defaults(handler=run_work)
+
+    status_parser = commands.add_parser("queue-status", help="count queue units by state")
+    status_parser.add_argument("queue", help="SQLite queue file")
+    status_parser.set_defaults(handler=run_queue_status)
+
+    export_parser = commands.add_parser("export", help="export results collected in a crawl queue")
+    export_parser.add_argument("queue", help="SQLite queue file")
+    export_parser.add_argument("--format", choices=["ndjson", "csv", "xlsx"], default="ndjson")
+    export_parser.add_argument("--output", "-o", help="output file (default: stdout)")
+    export_parser.set_defaults(handler=run_export)
+
+    season_parser = commands.add_parser("season", help="rank players across many races")
+    add_race_arguments(season_parser)
+    season_parser.add_argument("--queue", help="rank results already collected in a crawl queue instead of crawling")
+    season_parser.add_argument("--metric", choices=METRICS, default="total_kills")
+    season_parser.add_argument("--top", type=positive_int, help="only the best N players")
+    season_parser.add_argument("--format", choices=["ndjson", "csv", "xlsx"], default="ndjson")
+    season_parser.add_argument("--output", "-o", help="output file (default: stdout)")
+    season_parser.add_argument("--concurrency", "-j", type=positive_int, default=4, help="races crawled in parallel")
+    season_parser.add_argument("--quiet", "-q", action="store_true", help="no progress")
+    season_parser.add_argument("--debug", action="store_true")
+    season_parser.set_defaults(handler=run_season)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    sys.exit(args.handler(args))
@@ -0,0 +1,207 @@
+import aiohttp
+import asyncio
+import multiprocessing
+import os
+import socket
+import sqlite3
+import time
+from src.race_parser import RaceParser
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY,
+    race_type TEXT NOT NULL,
+    year TEXT NOT NULL,
+    identifier TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    UNIQUE (race_type, year, identifier, page)
+);
+CREATE INDEX IF NOT EXISTS units_state ON units (state, lease_expires);
+CREATE TABLE IF NOT EXISTS results (
+    unit_id INTEGER NOT NULL REFERENCES units (id),
+    rank TEXT,
+    name TEXT,
+    distance TEXT,
+    kills TEXT
+);
+CREATE INDEX IF NOT EXISTS results_unit ON results (unit_id);
+"""
+
+class CrawlQueue:
+    LEASE_SECONDS = 120
+    MAX_ATTEMPTS = 5
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA busy_timeout=60000")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def identifier_text(identifier):
+        return identifier if isinstance(identifier, str) else "/".join(identifier)
+
+    def enqueue(self, races):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = self.conn.executemany(
+                "INSERT OR IGNORE INTO units (race_type, year, identifier, page) VALUES (?, ?, ?, 1)",
+                [(race_type, year, self.identifier_text(identifier)) for race_type, year, identifier in races]
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return cursor.rowcount
+
+    def claim(self, owner):
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                "UPDATE units SET state = 'failed', lease_owner = NULL, lease_expires = NULL, "
+                "error = COALESCE(error, 'lease expired') "
+                "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.MAX_ATTEMPTS)
+            )
+            row = self.conn.execute(
+                "SELECT id, race_type, year, identifier, page FROM units "
+                "WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?) "
+                "ORDER BY id LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is not None:
+                self.conn.execute(
+                    "UPDATE units SET state = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    (owner, now + self.LEASE_SECONDS, row[0])
+                )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return row
+
+    def complete(self, unit_id, owner, participants):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            unit = self.conn.execute(
+                "SELECT race_type, year, identifier, page FROM units "
+                "WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (unit_id, owner)
+            ).fetchone()
+            if unit is None:
+                self.conn.execute("ROLLBACK")
+                return False
+
+            self.conn.execute("DELETE FROM results WHERE unit_id = ?", (unit_id,))
+            self.conn.executemany(
+                "INSERT INTO results (unit_id, rank, name, distance, kills) VALUES (?, ?, ?, ?, ?)",
+                [(unit_id, p['rank'], p['name'], p['distance'], p['kills']) for p in participants]
+            )
+            self.conn.execute(
+                "UPDATE units SET state = 'done', lease_owner = NULL, lease_expires = NULL, error = NULL WHERE id = ?",
+                (unit_id,)
+            )
+            if participants:
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO units (race_type, year, identifier, page) VALUES (?, ?, ?, ?)",
+                    (unit[0], unit[1], unit[2], unit[3] + 1)
+                )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return True
+
+    def fail(self, unit_id, owner, error):
+        self.conn.execute(
+            "UPDATE units SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "lease_owner = NULL, lease_expires = NULL, error = ? "
+            "WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+            (self.MAX_ATTEMPTS, str(error), unit_id, owner)
+        )
+
+    def status(self):
+        return dict(self.conn.execute("SELECT state, COUNT(*) FROM units GROUP BY state").fetchall())
+
+    def has_open_units(self):
+        return self.conn.execute(
+            "SELECT 1 FROM units WHERE state IN ('pending', 'leased') LIMIT 1"
+        ).fetchone() is not None
+
+    def results(self):
+        cursor = self.conn.execute(
+            "SELECT u.race_type, u.year, u.identifier, r.rank, r.name, r.distance, r.kills "
+            "FROM results r JOIN units u ON u.id = r.unit_id "
+            "ORDER BY u.race_type, u.year, u.identifier, u.page, r.rowid"
+        )
+        for race_type, year, identifier, rank, name, distance, kills in cursor:
+            yield {
+                'race_type': race_type,
+                'year': year,
+                'race': identifier,
+                'rank': rank,
+                'name': name,
+                'distance': distance,
+                'kills': kills
+            }
+
+async def work_unit(queue, owner, session, debug):
+    unit = queue.claim(owner)
+    if unit is None:
+        return False
+
+    unit_id, race_type, year, identifier, page = unit
+    if race_type == "daily":
+        identifier = tuple(identifier.split('/'))
+
+    try:
+        participants = await RaceParser.parse_race(race_type, year, identifier, page, debug, session)
+    except Exception as e:
+        queue.fail(unit_id, owner, e)
+    else:
+        queue.complete(unit_id, owner, participants)
+    return True
+
+async def work(db_path, tasks, debug, poll_interval=1):
+    queue = CrawlQueue(db_path)
+    owner_prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+    async def worker(index):
+        owner = f"{owner_prefix}:{index}"
+        while True:
+            if await work_unit(queue, owner, session, debug):
+                continue
+            if not queue.has_open_units():
+                return
+            await asyncio.sleep(poll_interval)
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            await asyncio.gather(*(worker(index) for index in range(tasks)))
+    finally:
+        queue.close()
+
+def worker_main(db_path, tasks, debug):
+    asyncio.run(work(db_path, tasks, debug))
+
+def run_workers(db_path, processes, tasks=2, debug=False):
+    workers = [
+        multiprocessing.Process(target=worker_main, args=(db_path, tasks, debug))
+        for _ in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+    return [process.exitcode for process in workers]
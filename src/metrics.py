@@ -0,0 +1,173 @@
+import bisect
+import threading
+
+class Counter:
+    TYPE = "counter"
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.values = {} if self.label_names else {(): 0}
+        self.lock = threading.Lock()
+
+    def label_key(self, labels):
+        return tuple(str(labels.get(label, "")) for label in self.label_names)
+
+    def inc(self, amount=1, **labels):
+        key = self.label_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def total(self, **labels):
+        with self.lock:
+            return sum(
+                value for key, value in self.values.items()
+                if all(key[self.label_names.index(label)] == str(expected) for label, expected in labels.items())
+            )
+
+    def samples(self):
+        with self.lock:
+            items = list(self.values.items())
+        for key, value in items:
+            yield self.name, dict(zip(self.label_names, key)), value
+
+class Gauge(Counter):
+    TYPE = "gauge"
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self.label_key(labels)
+        with self.lock:
+            self.values[key] = value
+
+class Histogram:
+    TYPE = "histogram"
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def mean(self):
+        with self.lock:
+            return self.sum / self.count if self.count else 0
+
+    def samples(self):
+        with self.lock:
+            counts = list(self.counts)
+            count, total = self.count, self.sum
+
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            yield f"{self.name}_bucket", {'le': repr(float(bound))}, cumulative
+        yield f"{self.name}_bucket", {'le': "+Inf"}, count
+        yield f"{self.name}_sum", {}, total
+        yield f"{self.name}_count", {}, count
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    @staticmethod
+    def format_labels(labels):
+        if not labels:
+            return ""
+        escaped = (
+            f'{name}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+            for name, value in labels.items()
+        )
+        return "{" + ",".join(escaped) + "}"
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.TYPE}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{self.format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+class ParserMetrics(MetricsRegistry):
+    def __init__(self):
+        super().__init__()
+        self.fetch_seconds = self.register(Histogram(
+            "thronebutt_fetch_seconds", "Upstream page fetch latency",
+            (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+        ))
+        self.page_bytes = self.register(Histogram(
+            "thronebutt_page_bytes", "HTML size of fetched pages",
+            (10000, 50000, 100000, 250000, 500000, 1000000, 2000000)
+        ))
+        self.parse_seconds = self.register(Histogram(
+            "thronebutt_parse_seconds", "BeautifulSoup parse time per page",
+            (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+        ))
+        self.participants_per_page = self.register(Histogram(
+            "thronebutt_participants_per_page", "Participants extracted per page",
+            (0, 10, 25, 50, 100, 200)
+        ))
+        self.requests = self.register(Counter(
+            "thronebutt_requests_total", "Upstream requests by HTTP status", ("status",)
+        ))
+        self.errors = self.register(Counter(
+            "thronebutt_errors_total", "Errors by stage and reason", ("stage", "reason")
+        ))
+        self.retries = self.register(Counter(
+            "thronebutt_retries_total", "Retried upstream requests by HTTP status", ("status",)
+        ))
+        self.cache_lookups = self.register(Counter(
+            "thronebutt_cache_lookups_total", "Cache lookups by cache and result", ("cache", "result")
+        ))
+        self.cache_hit_ratio = self.register(Gauge(
+            "thronebutt_cache_hit_ratio", "Share of cache lookups that were hits", ("cache",)
+        ))
+        self.crawls_in_flight = self.register(Gauge(
+            "thronebutt_crawls_in_flight", "Full-race crawls currently running"
+        ))
+        self.fetches_in_flight = self.register(Gauge(
+            "thronebutt_fetches_in_flight", "Upstream page fetches currently running"
+        ))
+
+    def hit_ratio(self, cache):
+        hits = self.cache_lookups.total(cache=cache, result="hit")
+        total = self.cache_lookups.total(cache=cache)
+        return hits / total if total else 0
+
+    def render(self):
+        for cache in ("result", "page"):
+            self.cache_hit_ratio.set(self.hit_ratio(cache), cache=cache)
+        return super().render()
+
+    def summary(self):
+        return {
+            'requests': self.requests.total(),
+            'errors': self.errors.total(),
+            'retries': self.retries.total(),
+            'fetch_ms': self.fetch_seconds.mean() * 1000,
+            'page_kb': self.page_bytes.mean() / 1024,
+            'parse_ms': self.parse_seconds.mean() * 1000,
+            'participants': self.participants_per_page.mean(),
+            'result_hit_ratio': self.hit_ratio("result") * 100,
+            'page_hit_ratio': self.hit_ratio("page") * 100,
+            'crawls': self.crawls_in_flight.total(),
+            'fetches': self.fetches_in_flight.total()
+        }
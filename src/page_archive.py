@@ -0,0 +1,101 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+import zlib
+from src.race_parser import RaceParser
+
+class PageArchive:
+    DATA_FILE = "pages.dat"
+    INDEX_FILE = "index.jsonl"
+
+    def __init__(self, path, create=False):
+        self.path = path
+        self.data_path = os.path.join(path, self.DATA_FILE)
+        self.index_path = os.path.join(path, self.INDEX_FILE)
+        if create:
+            os.makedirs(path, exist_ok=True)
+        elif not (os.path.isfile(self.index_path) and os.path.isfile(self.data_path)):
+            raise FileNotFoundError(f"No page archive at {path}: {self.INDEX_FILE} and {self.DATA_FILE} are required")
+        self.index = {}
+        self.lock = threading.Lock()
+        self.load_index()
+
+    def load_index(self):
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self.index.setdefault(entry['url'], []).append(entry)
+
+    def record(self, url, text):
+        data = text.encode('utf-8')
+        digest = hashlib.sha1(data).hexdigest()
+
+        with self.lock:
+            history = self.index.get(url)
+            if history and history[-1]['sha1'] == digest:
+                offset, length = history[-1]['offset'], history[-1]['length']
+            else:
+                compressed = zlib.compress(data, 6)
+                with open(self.data_path, 'ab') as f:
+                    offset = f.seek(0, os.SEEK_END)
+                    f.write(compressed)
+                length = len(compressed)
+
+            entry = {
+                'url': url,
+                'fetched_at': time.time(),
+                'offset': offset,
+                'length': length,
+                'sha1': digest
+            }
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+            self.index.setdefault(url, []).append(entry)
+
+        return entry
+
+    def entries(self, url_prefix="", latest=False):
+        for url, history in self.index.items():
+            if not url.startswith(url_prefix):
+                continue
+            if latest:
+                yield history[-1]
+            else:
+                yield from history
+
+    def read(self, entry, data_file=None):
+        if data_file is None:
+            with open(self.data_path, 'rb') as f:
+                return self.read(entry, f)
+        data_file.seek(entry['offset'])
+        return zlib.decompress(data_file.read(entry['length'])).decode('utf-8')
+
+    def latest(self, url, before=None):
+        for entry in reversed(self.index.get(url, [])):
+            if before is None or entry['fetched_at'] <= before:
+                return self.read(entry)
+        return None
+
+    def reparse(self, url_prefix="", latest=False, processes=None):
+        entries = list(self.entries(url_prefix, latest))
+        with multiprocessing.Pool(processes, initializer=open_worker_archive, initargs=(self.data_path,)) as pool:
+            yield from zip(entries, pool.imap(parse_entry, entries, chunksize=16))
+
+worker_data_file = None
+
+def open_worker_archive(data_path):
+    global worker_data_file
+    worker_data_file = open(data_path, 'rb')
+
+def parse_entry(entry):
+    worker_data_file.seek(entry['offset'])
+    text = zlib.decompress(worker_data_file.read(entry['length'])).decode('utf-8')
+    return RaceParser.parse_html(text, False)
@@ -4,17 +4,15 @@ import datetime
 import asyncio
 import threading
 import csv
-import openpyxl
-from openpyxl.styles import Font
-from openpyxl.utils import get_column_letter
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
 
 from src.race_parser import RaceParser
+from src.race_values import parse_distance, parse_number
 from src.locale_manager import LocaleManager
 
 class RaceApp(tk.Tk):
+    HISTOGRAM_BINS = 30
+    DISPLAY_BATCH = 500
+    
     def __init__(self):
         super().__init__()
         self.locale = LocaleManager()
@@ -22,6 +20,10 @@ class RaceApp(tk.Tk):
         self.geometry("1000x700")
         self.resizable(True, True)
         self.participants_data = []
+        self.display_token = 0
+        self.dataset = None
+        self.loaded_race = {}
+        self.season_rankings = {}
         self.debug_mode = tk.BooleanVar(value=False)
         self.all_pages_mode = tk.BooleanVar(value=False)
         self.current_date = datetime.date.today()
@@ -32,6 +34,20 @@ class RaceApp(tk.Tk):
         self.menubar = tk.Menu(self)
         
         self.file_menu = tk.Menu(self.menubar, tearoff=0)
+        self.file_menu.add_command(
+            label=self.locale.tr('open_session'), 
+            command=self.open_session
+        )
+        self.file_menu.add_command(
+            label=self.locale.tr('save_session'), 
+            command=self.save_session
+        )
+        self.file_menu.add_separator()
+        self.file_menu.add_command(
+            label=self.locale.tr('parser_stats'), 
+            command=self.show_parser_stats
+        )
+        self.file_menu.add_separator()
         self.file_menu.add_command(
             label=self.locale.tr('exit_menu'), 
             command=self.destroy
@@ -67,11 +83,97 @@ class RaceApp(tk.Tk):
     
     def change_language(self, language):
         self.locale.set_language(language)
+        self.chart_cache = {}
         self.title(self.locale.tr('app_title'))
         self.update_ui_texts()
         self.config(menu=None)
         self.create_menu()
     
+    def session_meta(self):
+        return {**self.loaded_race, 'saved_at': datetime.datetime.now().isoformat(timespec='seconds')}
+    
+    def save_session(self):
+        if not self.participants_data:
+            messagebox.showwarning(
+                self.locale.tr('no_data'), 
+                self.locale.tr('no_data_message')
+            )
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".tbs",
+            filetypes=[(self.locale.tr('session_files'), "*.tbs")],
+            title=self.locale.tr('save_session')
+        )
+        
+        if not file_path:
+            return
+        
+        try:
+            dataset = self.ensure_dataset()
+            dataset.meta = self.session_meta()
+            dataset.save(file_path)
+            self.status_var.set(self.locale.tr('session_saved', path=file_path))
+        except Exception as e:
+            messagebox.showerror(
+                self.locale.tr('error_title'),
+                f"{self.locale.tr('session_error')}: {str(e)}"
+            )
+    
+    def open_session(self):
+        file_path = filedialog.askopenfilename(
+            filetypes=[(self.locale.tr('session_files'), "*.tbs")],
+            title=self.locale.tr('open_session')
+        )
+        
+        if not file_path:
+            return
+        
+        try:
+            from src.race_session import RaceSession
+            
+            dataset = RaceSession.load(file_path)
+            participants = dataset.participants()
+        except Exception as e:
+            messagebox.showerror(
+                self.locale.tr('error_title'),
+                f"{self.locale.tr('session_error')}: {str(e)}"
+            )
+            return
+        
+        self.replace_dataset(dataset)
+        self.participants_data = participants
+        meta = dataset.meta
+        self.loaded_race = {key: meta[key] for key in ('race_type', 'year', 'identifier') if key in meta}
+        self.restore_inputs(self.loaded_race)
+        self.display_current_data()
+        self.status_var.set(self.locale.tr('session_opened', count=len(self.participants_data)))
+    
+    def restore_inputs(self, race):
+        if race.get('race_type') not in ("daily", "weekly"):
+            return
+        
+        self.race_type.set(race['race_type'])
+        self.update_input_fields()
+        self.year.delete(0, tk.END)
+        self.year.insert(0, race.get('year', ''))
+        
+        if race['race_type'] == "daily" and "/" in race.get('identifier', ''):
+            month, day = race['identifier'].split('/')
+            self.month.delete(0, tk.END)
+            self.month.insert(0, month)
+            self.day.delete(0, tk.END)
+            self.day.insert(0, day)
+        elif race['race_type'] == "weekly":
+            self.week.delete(0, tk.END)
+            self.week.insert(0, race.get('identifier', ''))
+    
+    def show_parser_stats(self):
+        messagebox.showinfo(
+            self.locale.tr('parser_stats'),
+            self.locale.tr('parser_stats_message', **RaceParser.metrics.summary())
+        )
+    
     def update_ui_texts(self):
         self.input_frame.config(text=self.locale.tr('input_params'))
         self.race_type_label.config(text=self.locale.tr('race_type'))
@@ -113,7 +215,9 @@ class RaceApp(tk.Tk):
             self.locale.tr('kills_distribution'),
             self.locale.tr('top_distance'),
             self.locale.tr('top_kills'),
-            self.locale.tr('distance_vs_kills')
+            self.locale.tr('distance_vs_kills'),
+            self.locale.tr('season_kills'),
+            self.locale.tr('season_distance')
         ]
         self.graph_type['values'] = graph_types
         self.graph_type.current(0)
@@ -229,6 +333,8 @@ class RaceApp(tk.Tk):
         export_tab = ttk.Frame(self.notebook)
         self.notebook.add(export_tab, text=self.locale.tr('export_tab'))
         self.create_export_tab(export_tab)
+        
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
     
     def create_analysis_tab(self, parent):
         self.analysis_frame = ttk.LabelFrame(parent, text=self.locale.tr('graph_controls'))
@@ -242,7 +348,9 @@ class RaceApp(tk.Tk):
             self.locale.tr('kills_distribution'),
             self.locale.tr('top_distance'),
             self.locale.tr('top_kills'),
-            self.locale.tr('distance_vs_kills')
+            self.locale.tr('distance_vs_kills'),
+            self.locale.tr('season_kills'),
+            self.locale.tr('season_distance')
         ]
         
         self.graph_type = ttk.Combobox(
@@ -275,9 +383,14 @@ class RaceApp(tk.Tk):
         self.graph_frame = ttk.Frame(parent)
         self.graph_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
-        self.figure = plt.figure(figsize=(8, 5), dpi=100)
-        self.canvas = FigureCanvasTkAgg(self.figure, master=self.graph_frame)
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.figure = None
+        self.canvas = None
+        self.axes = None
+        self.chart_artists = None
+        self.chart_shape = None
+        self.chart_dataset = None
+        self.chart_cache = {}
+        self.chart_request = 0
         
         save_frame = ttk.Frame(parent)
         save_frame.pack(fill=tk.X, padx=10, pady=5)
@@ -288,6 +401,21 @@ class RaceApp(tk.Tk):
             command=self.save_graph
         )
         self.save_button.pack(side=tk.RIGHT, padx=5, pady=5)
+    
+    def ensure_figure(self):
+        if self.figure is not None:
+            return
+        
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
+        self.figure = Figure(figsize=(8, 5), dpi=100)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.graph_frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    
+    def on_tab_changed(self, event=None):
+        if self.notebook.index(self.notebook.select()) == 1:
+            self.after_idle(self.ensure_figure)
 
     def create_export_tab(self, parent):
         self.export_frame = ttk.LabelFrame(parent, text=self.locale.tr('export_settings'))
@@ -378,6 +506,12 @@ class RaceApp(tk.Tk):
             identifier = week
 
         self.participants_data = []
+        self.after(0, lambda: self.replace_dataset(None))
+        self.loaded_race = {
+            'race_type': race_type,
+            'year': year,
+            'identifier': identifier if isinstance(identifier, str) else "/".join(identifier)
+        }
         
         if all_pages:
             self.update_status(self.locale.tr('loading_all'))
@@ -444,6 +578,10 @@ class RaceApp(tk.Tk):
             self.update_display()
             if debug:
                 print(f"Total participants loaded: {len(self.participants_data)}")
+            from src.race_session import RaceSession
+            participants = self.participants_data
+            dataset = RaceSession.from_participants(participants, self.session_meta())
+            self.after(0, lambda: self.adopt_dataset(participants, dataset))
         else:
             self.update_status(self.locale.tr('no_participants'))
     
@@ -494,6 +632,10 @@ class RaceApp(tk.Tk):
             )
     
     def export_to_xlsx(self, file_path):
+        import openpyxl
+        from openpyxl.styles import Font
+        from openpyxl.utils import get_column_letter
+        
         wb = openpyxl.Workbook()
         ws = wb.active
         ws.title = self.locale.tr('participant_results')
@@ -559,13 +701,24 @@ class RaceApp(tk.Tk):
     
     def display_data(self, data):
         self.tree.delete(*self.tree.get_children())
-        for item in data:
+        self.display_token += 1
+        self.insert_rows(self.display_token, data, 0)
+    
+    def insert_rows(self, token, data, start):
+        if token != self.display_token:
+            return
+        
+        end = min(start + self.DISPLAY_BATCH, len(data))
+        for item in data[start:end]:
             self.tree.insert("", tk.END, values=(
                 item['rank'],
                 item['name'],
                 item['distance'],
                 item['kills']
             ))
+        
+        if end < len(data):
+            self.after(1, lambda: self.insert_rows(token, data, end))
     
     def search_participant(self):
         query = self.search_entry.get().lower().strip()
@@ -577,176 +730,344 @@ class RaceApp(tk.Tk):
         self.display_data(filtered)
     
     def plot_graph(self):
+        graph_type = self.graph_type.get()
+        season_metrics = {
+            self.locale.tr('season_kills'): 'total_kills',
+            self.locale.tr('season_distance'): 'best_distance'
+        }
+        
+        if graph_type in season_metrics:
+            self.plot_season(season_metrics[graph_type])
+            return
+        
         if not self.participants_data:
             self.analysis_status.set(self.locale.tr('no_data_for_analysis'))
             return
-            
+        
+        charts = {
+            self.locale.tr('distance_distribution'): self.distance_distribution_chart,
+            self.locale.tr('kills_distribution'): self.kills_distribution_chart,
+            self.locale.tr('top_distance'): self.top_distance_chart,
+            self.locale.tr('top_kills'): self.top_kills_chart,
+            self.locale.tr('distance_vs_kills'): self.distance_vs_kills_chart
+        }
+        build = charts.get(graph_type)
+        if build is None:
+            return
+        
         try:
-            self.figure.clear()
-            graph_type = self.graph_type.get()
             top_count = int(self.top_count.get())
+        except ValueError as e:
+            self.analysis_status.set(f"{self.locale.tr('graph_error')}: {str(e)}")
+            return
+        
+        if build in (self.distance_distribution_chart, self.kills_distribution_chart):
+            top_count = None
+        
+        self.chart_request += 1
+        request = self.chart_request
+        dataset = self.ensure_dataset()
+        if self.chart_dataset is not dataset:
+            self.chart_dataset = dataset
+            self.chart_cache = {}
+        
+        key = (build.__name__, top_count)
+        chart = self.chart_cache.get(key)
+        if chart is not None:
+            self.render_chart(chart)
+            return
+        
+        threading.Thread(
+            target=self.prepare_chart,
+            args=(request, build, dataset, key),
+            daemon=True
+        ).start()
+    
+    def prepare_chart(self, request, build, dataset, key):
+        top_count = key[1]
+        try:
+            chart = build(dataset) if top_count is None else build(dataset, top_count)
+        except Exception as e:
+            message = f"{self.locale.tr('graph_error')}: {str(e)}"
+            self.after(0, lambda: request == self.chart_request and self.analysis_status.set(message))
+            return
+        
+        self.after(0, lambda: self.finish_chart(request, dataset, key, chart))
+    
+    def finish_chart(self, request, dataset, key, chart):
+        if self.chart_dataset is dataset:
+            self.chart_cache[key] = chart
+        if request == self.chart_request:
+            self.render_chart(chart)
+    
+    def render_chart(self, chart):
+        try:
+            self.ensure_figure()
+            if self.axes is None:
+                self.axes = self.figure.add_subplot(111)
+                self.chart_shape = None
             
-            if graph_type == self.locale.tr('distance_distribution'):
-                self.plot_distance_distribution()
-            elif graph_type == self.locale.tr('kills_distribution'):
-                self.plot_kills_distribution()
-            elif graph_type == self.locale.tr('top_distance'):
-                self.plot_top_distance(top_count)
-            elif graph_type == self.locale.tr('top_kills'):
-                self.plot_top_kills(top_count)
-            elif graph_type == self.locale.tr('distance_vs_kills'):
-                self.plot_distance_vs_kills(top_count)
-                
-            self.canvas.draw()
+            ax = self.axes
+            shape = (chart['kind'], len(chart['labels']) if 'labels' in chart else len(chart['counts']))
+            if shape == self.chart_shape:
+                getattr(self, f"update_{chart['kind']}")(ax, chart)
+            else:
+                ax.cla()
+                self.chart_artists = getattr(self, f"draw_{chart['kind']}")(ax, chart)
+                self.chart_shape = shape
+            
+            ax.set_title(chart['title'])
+            ax.set_xlabel(chart.get('xlabel', ''))
+            ax.set_ylabel(chart.get('ylabel', ''))
+            ax.relim()
+            ax.autoscale_view()
+            self.canvas.draw_idle()
             self.analysis_status.set(self.locale.tr('graph_plotted'))
         except Exception as e:
+            self.chart_shape = None
             self.analysis_status.set(f"{self.locale.tr('graph_error')}: {str(e)}")
     
-    def parse_distance(self, distance_str):
-        if not distance_str:
-            return 0
+    def draw_hist(self, ax, chart):
+        edges = chart['edges']
+        bars = ax.bar(edges[:-1], chart['counts'], width=edges[1:] - edges[:-1], align='edge',
+                      color=chart['color'], edgecolor='black')
+        ax.grid(True, linestyle='--', alpha=0.7)
+        return bars
+    
+    def update_hist(self, ax, chart):
+        edges = chart['edges']
+        for bar, left, right, count in zip(self.chart_artists, edges[:-1], edges[1:], chart['counts']):
+            bar.set_x(left)
+            bar.set_width(right - left)
+            bar.set_height(count)
+            bar.set_facecolor(chart['color'])
+    
+    def draw_barh(self, ax, chart):
+        y_pos = range(len(chart['labels']))
+        bars = ax.barh(y_pos, chart['values'], color=chart['color'])
+        ax.set_yticks(y_pos)
+        ax.set_yticklabels(chart['labels'])
+        ax.invert_yaxis()
+        ax.grid(True, axis='x', linestyle='--', alpha=0.7)
+        return bars
+    
+    def update_barh(self, ax, chart):
+        for bar, value in zip(self.chart_artists, chart['values']):
+            bar.set_width(value)
+            bar.set_facecolor(chart['color'])
+        ax.set_yticklabels(chart['labels'])
+    
+    def draw_grouped(self, ax, chart):
+        count = len(chart['labels'])
+        width = 0.35
+        groups = [
+            ax.bar([i + offset for i in range(count)], values, width, label=label, color=color)
+            for (label, values, color), offset in zip(chart['series'], (-width / 2, width / 2))
+        ]
+        ax.set_xticks(range(count))
+        ax.set_xticklabels(chart['labels'], rotation=45, ha='right')
+        ax.legend()
+        ax.grid(True, linestyle='--', alpha=0.7)
+        return groups
+    
+    def update_grouped(self, ax, chart):
+        for bars, (_, values, _) in zip(self.chart_artists, chart['series']):
+            for bar, value in zip(bars, values):
+                bar.set_height(value)
+        ax.set_xticklabels(chart['labels'], rotation=45, ha='right')
+    
+    def season_scope(self):
+        race_type = self.race_type.get()
+        month = self.month.get().strip() if race_type == "daily" else ""
+        return race_type, self.year.get().strip(), month or None
+    
+    def plot_season(self, metric):
+        scope = self.season_scope()
+        rankings = self.season_rankings.get((scope, metric))
+        
+        if rankings is None:
+            self.plot_button.config(state=tk.DISABLED)
+            threading.Thread(
+                target=self.run_async_task,
+                args=(self.async_load_season(scope, metric),),
+                daemon=True
+            ).start()
+            return
+        
+        self.show_season(scope, metric, rankings)
+    
+    def show_season(self, scope, metric, rankings, failed=0, total=0):
         try:
-            parts = distance_str.split()
-            stage_level = parts[0]
-            loop = 0
-
-            if len(parts) > 1 and parts[1].startswith('L'):
-                loop = int(parts[1][1:])
+            top_count = int(self.top_count.get())
             
-            if stage_level == 'END?':
-                stage, level = 7, 4
-            elif stage_level == '???':
-                return 0
-            elif '-' in stage_level:
-                stage, level = map(int, stage_level.split('-'))
-            else:
-                return 0
-
-            base_levels = (stage - 1) * 3 + level
-
-            if stage == 7 and level == 4:
-                base_levels = 21
-
-            total_levels = loop * 21 + base_levels
-            return total_levels
+            players = rankings[:top_count]
+            if not players:
+                raise ValueError(self.locale.tr('no_valid_data'))
+        except Exception as e:
+            self.analysis_status.set(f"{self.locale.tr('graph_error')}: {str(e)}")
+            return
+        
+        self.chart_request += 1
+        self.render_chart({
+            'kind': 'barh',
+            'labels': [p['name'][:20] + ('...' if len(p['name']) > 20 else '') for p in players],
+            'values': [p[metric] for p in players],
+            'color': 'gold' if metric == 'total_kills' else 'lightgreen',
+            'title': f"{self.graph_type.get()} ({scope[1]}{'/' + scope[2] if scope[2] else ''})",
+            'xlabel': self.locale.tr('kills') if metric == 'total_kills' else self.locale.tr('total_levels')
+        })
+        
+        if failed:
+            self.analysis_status.set(self.locale.tr('season_failed', failed=failed, total=total))
+    
+    async def async_load_season(self, scope, metric):
+        from src.season import SeasonAggregator, collect_season, season_races
+        
+        try:
+            races = list(season_races(*scope))
+            
+            def progress(done, total):
+                self.after(0, lambda: self.analysis_status.set(
+                    self.locale.tr('loading_season', done=done, total=total)
+                ))
             
-        except (ValueError, IndexError):
-            return 0
+            with SeasonAggregator() as aggregator:
+                failed = await collect_season(aggregator, races, debug=self.debug_mode.get(), progress=progress)
+                results = {
+                    season_metric: aggregator.rankings(season_metric, top=100)
+                    for season_metric in ('total_kills', 'best_distance')
+                }
+        finally:
+            self.after(0, lambda: self.plot_button.config(state=tk.NORMAL))
+        
+        if not failed:
+            for season_metric, rankings in results.items():
+                self.season_rankings[(scope, season_metric)] = rankings
+        
+        self.after(0, lambda: self.show_season(scope, metric, results[metric], failed, len(races)))
+    
+    def parse_distance(self, distance_str):
+        return parse_distance(distance_str)
 
-    def plot_distance_distribution(self):
-        ax = self.figure.add_subplot(111)
-        distances = [self.parse_distance(p['distance']) for p in self.participants_data]
+    def ensure_dataset(self):
+        if self.dataset is None or len(self.dataset) != len(self.participants_data):
+            from src.race_session import RaceSession
+            self.replace_dataset(RaceSession.from_participants(self.participants_data, self.session_meta()))
+        return self.dataset
+    
+    def adopt_dataset(self, participants, dataset):
+        if participants is self.participants_data:
+            self.replace_dataset(dataset)
+    
+    def replace_dataset(self, dataset):
+        if self.chart_dataset is self.dataset:
+            self.chart_dataset = None
+            self.chart_cache = {}
+        self.dataset = dataset
+    
+    def short_name(self, dataset, index, length):
+        name = dataset.string('name', index)
+        return name[:length] + ('...' if len(name) > length else '')
 
-        distances = [d for d in distances if d > 0]
+    def histogram_chart(self, values, color, title, xlabel):
+        import numpy as np
         
-        if not distances:
-            raise ValueError(self.locale.tr('no_valid_distance'))
+        counts, edges = np.histogram(values, bins=self.HISTOGRAM_BINS)
+        return {
+            'kind': 'hist',
+            'counts': counts,
+            'edges': edges,
+            'color': color,
+            'title': title,
+            'xlabel': xlabel,
+            'ylabel': self.locale.tr('participant_count')
+        }
+    
+    def top_indices(self, values, mask, top_count):
+        import numpy as np
         
-        ax.hist(distances, bins=30, color='skyblue', edgecolor='black')
-        ax.set_title(self.locale.tr('distance_distribution'))
-        ax.set_xlabel(self.locale.tr('total_levels'))
-        ax.set_ylabel(self.locale.tr('participant_count'))
-        ax.grid(True, linestyle='--', alpha=0.7)
-
-    def plot_top_distance(self, top_count):
-        valid_participants = [
-            p for p in self.participants_data 
-            if self.parse_distance(p['distance']) > 0
-        ]
+        valid = np.flatnonzero(mask) if mask is not None else np.arange(values.size)
+        if valid.size > top_count:
+            candidates = valid[np.argpartition(-values[valid], top_count - 1)[:top_count]]
+            threshold = values[candidates].min()
+            valid = valid[values[valid] >= threshold]
+        return valid[np.argsort(-values[valid], kind='stable')][:top_count]
+    
+    def distance_distribution_chart(self, dataset):
+        distances = dataset.column('distance_levels')
+        distances = distances[distances > 0]
         
-        if not valid_participants:
+        if not distances.size:
             raise ValueError(self.locale.tr('no_valid_distance'))
-
-        sorted_data = sorted(
-            valid_participants,
-            key=lambda x: self.parse_distance(x['distance']),
-            reverse=True
-        )[:top_count]
         
-        names = [p['name'][:20] + ('...' if len(p['name']) > 20 else '') for p in sorted_data]
-        distances = [self.parse_distance(p['distance']) for p in sorted_data]
+        return self.histogram_chart(
+            distances, 'skyblue',
+            self.locale.tr('distance_distribution'),
+            self.locale.tr('total_levels')
+        )
+    
+    def kills_distribution_chart(self, dataset):
+        kills = dataset.column('kills_number')
+        kills = kills[kills > 0]
         
-        ax = self.figure.add_subplot(111)
-        y_pos = np.arange(len(names))
+        if not kills.size:
+            raise ValueError(self.locale.tr('no_valid_kills'))
         
-        ax.barh(y_pos, distances, color='lightgreen')
-        ax.set_yticks(y_pos)
-        ax.set_yticklabels(names)
-        ax.invert_yaxis()
-        ax.set_title(self.locale.tr('top_distance', count=top_count))
-        ax.set_xlabel(self.locale.tr('total_levels'))
-        ax.grid(True, axis='x', linestyle='--', alpha=0.7)
+        return self.histogram_chart(
+            kills, 'salmon',
+            self.locale.tr('kills_distribution'),
+            self.locale.tr('kills')
+        )
 
-    def plot_distance_vs_kills(self, top_count):
-        valid_participants = [
-            p for p in self.participants_data 
-            if self.parse_distance(p['distance']) > 0 and self.parse_number(p['kills']) > 0
-        ]
+    def top_distance_chart(self, dataset, top_count):
+        distances = dataset.column('distance_levels')
+        top = self.top_indices(distances, distances > 0, top_count)
         
-        if not valid_participants:
-            raise ValueError(self.locale.tr('no_valid_data'))
+        if not top.size:
+            raise ValueError(self.locale.tr('no_valid_distance'))
+        
+        return {
+            'kind': 'barh',
+            'labels': [self.short_name(dataset, i, 20) for i in top],
+            'values': distances[top],
+            'color': 'lightgreen',
+            'title': self.locale.tr('top_distance', count=top_count),
+            'xlabel': self.locale.tr('total_levels')
+        }
 
-        sorted_data = sorted(
-            valid_participants,
-            key=lambda x: self.parse_distance(x['distance']),
-            reverse=True
-        )[:top_count]
-        
-        names = [p['name'][:15] + ('...' if len(p['name']) > 15 else '') for p in sorted_data]
-        distances = [self.parse_distance(p['distance']) for p in sorted_data]
-        kills = [self.parse_number(p['kills']) for p in sorted_data]
-        
-        ax = self.figure.add_subplot(111)
-        x_pos = np.arange(len(names))
-        width = 0.35
+    def top_kills_chart(self, dataset, top_count):
+        kills = dataset.column('kills_number')
+        top = self.top_indices(kills, None, top_count)
         
-        ax.bar(x_pos - width/2, distances, width, label=self.locale.tr('total_levels'), color='skyblue')
-        ax.bar(x_pos + width/2, kills, width, label=self.locale.tr('kills'), color='salmon')
+        return {
+            'kind': 'barh',
+            'labels': [self.short_name(dataset, i, 20) for i in top],
+            'values': kills[top],
+            'color': 'gold',
+            'title': self.locale.tr('top_kills', count=top_count),
+            'xlabel': self.locale.tr('kills')
+        }
+
+    def distance_vs_kills_chart(self, dataset, top_count):
+        distances = dataset.column('distance_levels')
+        kills = dataset.column('kills_number')
+        top = self.top_indices(distances, (distances > 0) & (kills > 0), top_count)
         
-        ax.set_xticks(x_pos)
-        ax.set_xticklabels(names, rotation=45, ha='right')
-        ax.set_title(self.locale.tr('distance_vs_kills', count=top_count))
-        ax.legend()
-        ax.grid(True, linestyle='--', alpha=0.7)
-    
-    def plot_kills_distribution(self):
-        ax = self.figure.add_subplot(111)
-        kills = [self.parse_number(p['kills']) for p in self.participants_data]
-        kills = [k for k in kills if k > 0]
-        if not kills:
-            raise ValueError(self.locale.tr('no_valid_kills'))
-        ax.hist(kills, bins=30, color='salmon', edgecolor='black')
-        ax.set_title(self.locale.tr('kills_distribution'))
-        ax.set_xlabel(self.locale.tr('kills'))
-        ax.set_ylabel(self.locale.tr('participant_count'))
-        ax.grid(True, linestyle='--', alpha=0.7)
-    
-    def plot_top_kills(self, top_count):
-        sorted_data = sorted(
-            self.participants_data,
-            key=lambda x: self.parse_number(x['kills']),
-            reverse=True
-        )[:top_count]
-        names = [p['name'][:20] + ('...' if len(p['name']) > 20 else '') for p in sorted_data]
-        kills = [self.parse_number(p['kills']) for p in sorted_data]
-        ax = self.figure.add_subplot(111)
-        y_pos = np.arange(len(names))
-        ax.barh(y_pos, kills, color='gold')
-        ax.set_yticks(y_pos)
-        ax.set_yticklabels(names)
-        ax.invert_yaxis()
-        ax.set_title(self.locale.tr('top_kills', count=top_count))
-        ax.set_xlabel(self.locale.tr('kills'))
-        ax.grid(True, axis='x', linestyle='--', alpha=0.7)
+        if not top.size:
+            raise ValueError(self.locale.tr('no_valid_data'))
+        
+        return {
+            'kind': 'grouped',
+            'labels': [self.short_name(dataset, i, 15) for i in top],
+            'series': [
+                (self.locale.tr('total_levels'), distances[top], 'skyblue'),
+                (self.locale.tr('kills'), kills[top], 'salmon')
+            ],
+            'title': self.locale.tr('distance_vs_kills', count=top_count)
+        }
     
     def parse_number(self, value):
-        if isinstance(value, (int, float)):
-            return float(value)
-        try:
-            cleaned = ''.join(ch for ch in str(value) if ch.isdigit() or ch in ['.', '-'])
-            return float(cleaned) if cleaned else 0.0
-        except ValueError:
-            return 0.0
+        return parse_number(value)
     
     def save_graph(self):
         if not self.participants_data:
@@ -771,6 +1092,7 @@ class RaceApp(tk.Tk):
             return
             
         try:
+            self.ensure_figure()
             self.figure.savefig(file_path, bbox_inches='tight', dpi=100)
             messagebox.showinfo(
                 self.locale.tr('success'),
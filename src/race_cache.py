@@ -0,0 +1,58 @@
+import time
+from collections import OrderedDict
+from src.race_parser import RaceParser
+
+class RaceCache:
+    def __init__(self, ttl=300, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    @staticmethod
+    def make_key(race_type, year, identifier):
+        if isinstance(identifier, (tuple, list)):
+            parts = identifier
+        else:
+            parts = str(identifier).split('/')
+        parts = [str(int(part)) if str(part).isdigit() else str(part) for part in parts]
+        return (race_type, str(year), "/".join(parts))
+
+    def is_fresh(self, key):
+        entry = self.entries.get(key)
+        return entry is not None and time.monotonic() - entry['updated'] <= self.ttl
+
+    def get(self, key):
+        if not self.is_fresh(key):
+            RaceParser.metrics.cache_lookups.inc(cache="result", result="miss")
+            return None
+        RaceParser.metrics.cache_lookups.inc(cache="result", result="hit")
+        self.entries.move_to_end(key)
+        return self.entries[key]['participants']
+
+    def get_page(self, key, page):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        index = int(page) - 1
+        if 0 <= index < len(entry['pages']):
+            return entry['pages'][index]
+        return None
+
+    def store(self, key, pages):
+        previous = self.entries.get(key)
+        previous_pages = previous['pages'] if previous else []
+
+        changed = sum(
+            1 for index, (digest, _) in enumerate(pages)
+            if index >= len(previous_pages) or previous_pages[index][0] != digest
+        )
+
+        self.entries[key] = {
+            'pages': pages,
+            'participants': [participant for _, page_data in pages for participant in page_data],
+            'updated': time.monotonic()
+        }
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return changed
@@ -0,0 +1,35 @@
+class RaceDiff:
+    FIELDS = ('rank', 'distance', 'kills')
+
+    @staticmethod
+    def index(participants):
+        return {participant['name']: participant for participant in participants}
+
+    @staticmethod
+    def diff(old, new):
+        old_index = RaceDiff.index(old)
+        new_index = RaceDiff.index(new)
+
+        added = []
+        changed = []
+        for name, participant in new_index.items():
+            previous = old_index.get(name)
+            if previous is None:
+                added.append(participant)
+                continue
+
+            fields = {
+                field: participant[field]
+                for field in RaceDiff.FIELDS
+                if participant[field] != previous[field]
+            }
+            if fields:
+                changed.append({'name': name, **fields})
+
+        removed = [name for name in old_index if name not in new_index]
+
+        return {'added': added, 'changed': changed, 'removed': removed}
+
+    @staticmethod
+    def is_empty(delta):
+        return not (delta['added'] or delta['changed'] or delta['removed'])
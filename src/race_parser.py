@@ -1,87 +1,211 @@
 import aiohttp
 from bs4 import BeautifulSoup
+import asyncio
+import hashlib
 import re
+import time
+from src.metrics import ParserMetrics
+from src.tracing import Tracer
+
+class PartialRaceError(Exception):
+    def __init__(self, participants, pages, error):
+        super().__init__(f"Race stopped after {pages} pages: {error}")
+        self.participants = participants
+        self.pages = pages
+        self.error = error
 
 class RaceParser:
     BASE_URL = "https://thronebutt.com"
-    
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    MAX_RETRIES = 2
+    RETRY_DELAY = 1
+    BACKENDS = ("html.parser", "lxml", "html5lib")
+    backend = "html.parser"
+    metrics = ParserMetrics()
+    tracer = Tracer()
+    archive = None
+    replay = False
+    replay_before = None
+
+    @staticmethod
+    def build_url(race_type, year, identifier, page, debug=False):
+        with RaceParser.tracer.span("url", debug, race_type=race_type, year=year, page=page) as span:
+            if race_type == "daily":
+                url = f"{RaceParser.BASE_URL}/daily/{year}/{identifier[0]}/{identifier[1]}/{page}"
+            else:
+                url = f"{RaceParser.BASE_URL}/weekly/{year}/{identifier}/{page}"
+            span.set(url=url)
+        return url
+
     @staticmethod
-    async def get_participants(url, debug):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                text = await response.text()
-    
-        if debug:
-            print(f"HTTP status: {response.status}")
-            print(f"Response size: {len(text)} байт")
-        
-        soup = BeautifulSoup(text, 'html.parser')
+    async def fetch_page(url, debug, session=None):
+        if RaceParser.replay:
+            return RaceParser.replay_page(url, debug)
+
+        if session is None:
+            async with aiohttp.ClientSession() as session:
+                return await RaceParser.fetch_page(url, debug, session)
+
+        metrics = RaceParser.metrics
+        attempt = 0
+
+        with RaceParser.tracer.span("fetch", debug, url=url) as span:
+            while True:
+                started = time.perf_counter()
+                metrics.fetches_in_flight.inc()
+                try:
+                    async with session.get(url) as response:
+                        status = response.status
+                        metrics.requests.inc(status=status)
+                        retry = status in RaceParser.RETRY_STATUSES and attempt < RaceParser.MAX_RETRIES
+                        if not retry:
+                            response.raise_for_status()
+                            text = await response.text()
+                except Exception as e:
+                    metrics.errors.inc(stage="fetch", reason=getattr(e, 'status', type(e).__name__))
+                    raise
+                finally:
+                    metrics.fetches_in_flight.dec()
+
+                if not retry:
+                    break
+
+                attempt += 1
+                metrics.retries.inc(status=status)
+                await asyncio.sleep(RaceParser.RETRY_DELAY * attempt)
+
+            metrics.fetch_seconds.observe(time.perf_counter() - started)
+            metrics.page_bytes.observe(len(text))
+            span.set(status=status, bytes=len(text), retries=attempt)
+
+        if RaceParser.archive is not None:
+            RaceParser.archive.record(url, text)
+
+        return text
+
+    @staticmethod
+    def replay_page(url, debug):
+        with RaceParser.tracer.span("replay", debug, url=url) as span:
+            text = RaceParser.archive.latest(url, RaceParser.replay_before)
+            if text is None:
+                raise LookupError(f"Page is not archived: {url}")
+            span.set(bytes=len(text))
+        return text
+
+    @staticmethod
+    def parse_html(text, debug):
+        started = time.perf_counter()
+        with RaceParser.tracer.span("parse", debug, bytes=len(text)) as span:
+            participants = RaceParser.extract_participants(text, debug)
+            span.set(participants=len(participants))
+        RaceParser.metrics.parse_seconds.observe(time.perf_counter() - started)
+        RaceParser.metrics.participants_per_page.observe(len(participants))
+        return participants
+
+    @staticmethod
+    def extract_plate(plate):
+        rank = plate.get('data-rank', 'N/A')
+
+        name_div = plate.select_one('div.break-all, div.break-words')
+        name = name_div.get_text(strip=True) if name_div else "N/A"
+
+        level_spans = plate.select('div.flex.flex-col.gap-1 span')
+        distance = " ".join(span.get_text(strip=True) for span in level_spans) if level_spans else "N/A"
+
+        kills_div = plate.select_one('div.hidden.sm\\:flex div.nt-text-shadow.text-right')
+
+        if not kills_div:
+            kills_div = plate.select_one('div.flex.sm\\:hidden div.nt-text-shadow')
+
+        kills = kills_div.get_text(strip=True).replace(',', '') if kills_div else "N/A"
+
+        return {
+            'rank': rank,
+            'name': name,
+            'distance': distance,
+            'kills': kills
+        }
+
+    @staticmethod
+    def extract_participants(text, debug):
+        soup = BeautifulSoup(text, RaceParser.backend)
 
         no_scores = soup.find('div', class_=re.compile(r'text-center'))
         if no_scores and "No scores!" in no_scores.get_text():
-            if debug:
-                print("No scores detected - no participants")
             return []
-        
+
         participants = []
         score_plates = soup.find_all('div', class_='score_plate')
+        traced = RaceParser.tracer.enabled(debug)
 
-        if debug:
-            print(f"Records found: {len(score_plates)}")
-        
         for plate in score_plates:
             try:
-                rank = plate.get('data-rank', 'N/A')
-
-                name_div = plate.select_one('div.break-all, div.break-words')
-                name = name_div.get_text(strip=True) if name_div else "N/A"
-
-                level_spans = plate.select('div.flex.flex-col.gap-1 span')
-                distance = " ".join(span.get_text(strip=True) for span in level_spans) if level_spans else "N/A"
-
-                kills_div = plate.select_one('div.hidden.sm\\:flex div.nt-text-shadow.text-right')
-
-                if not kills_div:
-                    kills_div = plate.select_one('div.flex.sm\\:hidden div.nt-text-shadow')
-                
-                kills = kills_div.get_text(strip=True).replace(',', '') if kills_div else "N/A"
-                
-                if debug:
-                    print(f"Participant: rank={rank}, name={name}, distance={distance}, kills={kills}")
-                
-                participants.append({
-                    'rank': rank,
-                    'name': name,
-                    'distance': distance,
-                    'kills': kills
-                })
+                if traced:
+                    with RaceParser.tracer.span("plate", debug) as span:
+                        participant = RaceParser.extract_plate(plate)
+                        span.set(**participant)
+                else:
+                    participant = RaceParser.extract_plate(plate)
+                participants.append(participant)
             except Exception as e:
-                if debug:
-                    print(f"Error processing element: {str(e)}")
+                RaceParser.metrics.errors.inc(stage="plate", reason=type(e).__name__)
                 continue
-            
+
         return participants
 
     @staticmethod
-    async def parse_race(race_type, year, identifier, page, debug=False):
-        if debug:
-            print(f"Start of parsing: {race_type}, {year}, {identifier}, page {page}")
-        
-        if race_type == "daily":
-            url = f"{RaceParser.BASE_URL}/daily/{year}/{identifier[0]}/{identifier[1]}/{page}"
-        else:
-            url = f"{RaceParser.BASE_URL}/weekly/{year}/{identifier}/{page}"
-        
-        if debug:
-            print(f"URL generation: {url}")
-        
+    async def get_participants(url, debug, session=None):
+        text = await RaceParser.fetch_page(url, debug, session)
+        return RaceParser.parse_html(text, debug)
+
+    @staticmethod
+    async def parse_race(race_type, year, identifier, page, debug=False, session=None):
+        url = RaceParser.build_url(race_type, year, identifier, page, debug)
+        return await RaceParser.get_participants(url, debug, session)
+
+    @staticmethod
+    async def crawl_race(race_type, year, identifier, debug=False, cache=None):
+        key = cache.make_key(race_type, year, identifier) if cache else None
+        pages = []
+        current_page = 1
+
+        RaceParser.metrics.crawls_in_flight.inc()
         try:
-            return await RaceParser.get_participants(url, debug)
-        except Exception as e:
-            if debug:
-                print(f"Parsing error: {str(e)}")
-                import traceback
-                traceback.print_exc()
-            raise
-    
\ No newline at end of file
+            with RaceParser.tracer.span("crawl", debug, race_type=race_type, year=year, identifier=identifier) as span:
+                async with aiohttp.ClientSession() as session:
+                    while True:
+                        url = RaceParser.build_url(race_type, year, identifier, current_page, debug)
+                        try:
+                            text = await RaceParser.fetch_page(url, debug, session)
+                        except Exception as e:
+                            if not pages:
+                                raise
+                            participants = [participant for _, page_data in pages for participant in page_data]
+                            raise PartialRaceError(participants, len(pages), e) from e
+
+                        digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+                        cached = cache.get_page(key, current_page) if cache else None
+                        if cache:
+                            RaceParser.metrics.cache_lookups.inc(
+                                cache="page", result="hit" if cached and cached[0] == digest else "miss"
+                            )
+
+                        if cached and cached[0] == digest:
+                            page_data = cached[1]
+                        else:
+                            page_data = RaceParser.parse_html(text, debug)
+
+                        if not page_data:
+                            break
+
+                        pages.append((digest, page_data))
+                        current_page += 1
+
+                if cache:
+                    span.set(changed=cache.store(key, pages))
+                span.set(pages=len(pages))
+        finally:
+            RaceParser.metrics.crawls_in_flight.dec()
+
+        return [participant for _, page_data in pages for participant in page_data]
@@ -0,0 +1,153 @@
+import json
+import os
+import struct
+import tempfile
+from collections.abc import Sequence
+import numpy as np
+from src.race_values import parse_distance, parse_number
+
+class RaceSession:
+    MAGIC = b"TBSESS01"
+    ALIGN = 64
+    STRING_COLUMNS = ('rank', 'name', 'distance', 'kills')
+    SEPARATOR = "\x00"
+
+    def __init__(self, arrays, rows, meta=None, path=None):
+        self.arrays = arrays
+        self.rows = rows
+        self.meta = meta or {}
+        self.decoded = {}
+        self.path = path
+
+    def __len__(self):
+        return self.rows
+
+    @classmethod
+    def from_participants(cls, participants, meta=None):
+        arrays = {
+            'rank_number': np.array(
+                [int(p['rank']) if str(p['rank']).isdigit() else -1 for p in participants], dtype=np.int32
+            ),
+            'kills_number': np.array([parse_number(p['kills']) for p in participants], dtype=np.float64),
+            'distance_levels': np.array([parse_distance(p['distance']) for p in participants], dtype=np.int32)
+        }
+
+        for column in cls.STRING_COLUMNS:
+            encoded = [str(p[column]).replace(cls.SEPARATOR, "").encode('utf-8') for p in participants]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(value) + 1 for value in encoded], out=offsets[1:])
+            arrays[f"{column}_offsets"] = offsets
+            arrays[f"{column}_data"] = np.frombuffer(
+                b"".join(value + b"\x00" for value in encoded), dtype=np.uint8
+            )
+
+        return cls(arrays, len(participants), meta)
+
+    def column(self, name):
+        return self.arrays[name]
+
+    def strings(self, column):
+        if column not in self.decoded:
+            data = self.arrays[f"{column}_data"]
+            text = data.tobytes().decode('utf-8')
+            self.decoded[column] = text.split(self.SEPARATOR)[:-1] if self.rows else []
+        return self.decoded[column]
+
+    def string(self, column, index):
+        if column in self.decoded:
+            return self.decoded[column][index]
+        offsets = self.arrays[f"{column}_offsets"]
+        data = self.arrays[f"{column}_data"]
+        return data[offsets[index]:offsets[index + 1] - 1].tobytes().decode('utf-8')
+
+    def participant(self, index):
+        return {column: self.string(column, index) for column in self.STRING_COLUMNS}
+
+    def participants(self):
+        return SessionRows(self)
+
+    def detach(self):
+        if self.path is not None:
+            self.arrays = {name: np.array(array) for name, array in self.arrays.items()}
+            self.path = None
+
+    @staticmethod
+    def file_mode(path):
+        try:
+            return os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
+
+    def save(self, path):
+        if self.path is not None and os.path.abspath(self.path) == os.path.abspath(path):
+            self.detach()
+
+        layout = {}
+        offset = 0
+        for name, array in self.arrays.items():
+            offset = -(-offset // self.ALIGN) * self.ALIGN
+            layout[name] = {'dtype': array.dtype.str, 'offset': offset, 'count': int(array.size)}
+            offset += array.nbytes
+
+        header = json.dumps({'version': 1, 'rows': self.rows, 'meta': self.meta, 'columns': layout}).encode('utf-8')
+        prefix = len(self.MAGIC) + 4 + len(header)
+        start = -(-prefix // self.ALIGN) * self.ALIGN
+
+        fd, temp_path = tempfile.mkstemp(prefix=".session-", dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            if hasattr(os, 'fchmod'):
+                os.fchmod(fd, self.file_mode(path))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self.MAGIC)
+                f.write(struct.pack('<I', len(header)))
+                f.write(header)
+                for name, array in self.arrays.items():
+                    f.seek(start + layout[name]['offset'])
+                    f.write(np.ascontiguousarray(array).tobytes())
+                f.truncate(start + offset)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            if f.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError("Not a session file")
+            header_length, = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(header_length).decode('utf-8'))
+
+        start = -(-(len(cls.MAGIC) + 4 + header_length) // cls.ALIGN) * cls.ALIGN
+        buffer = np.memmap(path, dtype=np.uint8, mode='r')
+
+        arrays = {}
+        for name, column in header['columns'].items():
+            dtype = np.dtype(column['dtype'])
+            begin = start + column['offset']
+            arrays[name] = buffer[begin:begin + column['count'] * dtype.itemsize].view(dtype)
+
+        return cls(arrays, header['rows'], header['meta'], path)
+
+class SessionRows(Sequence):
+    def __init__(self, session):
+        self.session = session
+
+    def __len__(self):
+        return len(self.session)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.session.participant(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.session.participant(index)
+
+    def __iter__(self):
+        columns = [self.session.strings(column) for column in RaceSession.STRING_COLUMNS]
+        for values in zip(*columns):
+            yield dict(zip(RaceSession.STRING_COLUMNS, values))
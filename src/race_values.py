@@ -0,0 +1,39 @@
+def parse_distance(distance_str):
+    if not distance_str:
+        return 0
+    try:
+        parts = distance_str.split()
+        stage_level = parts[0]
+        loop = 0
+
+        if len(parts) > 1 and parts[1].startswith('L'):
+            loop = int(parts[1][1:])
+
+        if stage_level == 'END?':
+            stage, level = 7, 4
+        elif stage_level == '???':
+            return 0
+        elif '-' in stage_level:
+            stage, level = map(int, stage_level.split('-'))
+        else:
+            return 0
+
+        base_levels = (stage - 1) * 3 + level
+
+        if stage == 7 and level == 4:
+            base_levels = 21
+
+        total_levels = loop * 21 + base_levels
+        return total_levels
+
+    except (ValueError, IndexError):
+        return 0
+
+def parse_number(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        cleaned = ''.join(ch for ch in str(value) if ch.isdigit() or ch in ['.', '-'])
+        return float(cleaned) if cleaned else 0.0
+    except ValueError:
+        return 0.0
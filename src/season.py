@@ -0,0 +1,152 @@
+import asyncio
+import calendar
+import datetime
+import heapq
+import itertools
+import json
+import os
+import tempfile
+from src.race_parser import PartialRaceError, RaceParser
+from src.race_values import parse_distance, parse_number
+
+METRICS = ('total_kills', 'best_kills', 'total_distance', 'best_distance', 'races')
+
+def season_races(race_type, year, month=None, today=None):
+    today = today or datetime.date.today()
+    year = int(year)
+
+    if race_type == "daily":
+        months = [int(month)] if month else range(1, 13)
+        for current_month in months:
+            for day in range(1, calendar.monthrange(year, current_month)[1] + 1):
+                date = datetime.date(year, current_month, day)
+                if date > today:
+                    return
+                yield "daily", str(year), (f"{current_month:02d}", f"{day:02d}")
+    else:
+        weeks = datetime.date(year, 12, 28).isocalendar()[1]
+        for week in range(1, weeks + 1):
+            if datetime.date.fromisocalendar(year, week, 1) > today:
+                return
+            yield "weekly", str(year), str(week)
+
+class SeasonAggregator:
+    MAX_FAN_IN = 64
+
+    def __init__(self):
+        self.directory = tempfile.TemporaryDirectory(prefix="season-")
+        self.levels = [[]]
+        self.races = 0
+        self.files = 0
+
+    @property
+    def runs(self):
+        return [path for level in self.levels for path in level]
+
+    def close(self):
+        self.directory.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def write_run(self, rows):
+        path = os.path.join(self.directory.name, f"{self.files}.jsonl")
+        self.files += 1
+        with open(path, 'w', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return path
+
+    def add_race(self, participants):
+        run = self.races
+        self.races += 1
+        rows = sorted(
+            (participant['name'], run, parse_distance(participant['distance']), parse_number(participant['kills']))
+            for participant in participants
+        )
+        self.levels[0].append(self.write_run(rows))
+        self.compact()
+
+    def compact(self):
+        for level, paths in enumerate(self.levels):
+            if len(paths) < self.MAX_FAN_IN:
+                break
+            merged = self.write_run(heapq.merge(*(self.read_run(path) for path in paths)))
+            for path in paths:
+                os.remove(path)
+            self.levels[level] = []
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+            self.levels[level + 1].append(merged)
+
+    @staticmethod
+    def read_run(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield tuple(json.loads(line))
+
+    def players(self):
+        merged = heapq.merge(*(self.read_run(path) for path in self.runs))
+        for name, rows in itertools.groupby(merged, key=lambda row: row[0]):
+            player = {
+                'name': name, 'races': 0,
+                'total_kills': 0, 'best_kills': 0,
+                'total_distance': 0, 'best_distance': 0
+            }
+            last_run = None
+            for _, run, distance, kills in rows:
+                if run != last_run:
+                    player['races'] += 1
+                    last_run = run
+                player['total_kills'] += kills
+                player['best_kills'] = max(player['best_kills'], kills)
+                player['total_distance'] += distance
+                player['best_distance'] = max(player['best_distance'], distance)
+            yield player
+
+    def rankings(self, metric="total_kills", top=None):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        key = lambda player: (player[metric], player['name'])
+        if top:
+            ranked = heapq.nlargest(top, self.players(), key=key)
+        else:
+            ranked = sorted(self.players(), key=key, reverse=True)
+        return [{'rank': index, **player} for index, player in enumerate(ranked, 1)]
+
+async def collect_season(aggregator, races, concurrency=4, debug=False, cache=None, progress=None):
+    semaphore = asyncio.Semaphore(concurrency)
+    failed = 0
+
+    async def crawl(race):
+        if cache is not None:
+            participants = cache.get(cache.make_key(*race))
+            if participants is not None:
+                return participants, None
+
+        async with semaphore:
+            try:
+                return await RaceParser.crawl_race(*race, debug), None
+            except PartialRaceError as e:
+                return e.participants, e
+            except Exception as e:
+                return [], e
+
+    tasks = [asyncio.create_task(crawl(race)) for race in races]
+    for done, task in enumerate(asyncio.as_completed(tasks), 1):
+        participants, error = await task
+        if error is not None:
+            failed += 1
+        if participants:
+            aggregator.add_race(participants)
+        if progress:
+            progress(done, len(tasks))
+    return failed
+
+def collect_queue_season(aggregator, queue):
+    for _, rows in itertools.groupby(queue.results(), key=lambda row: (row['race_type'], row['year'], row['race'])):
+        aggregator.add_race(rows)
@@ -0,0 +1,152 @@
+import sqlite3
+import threading
+import time
+from src.race_cache import RaceCache
+from src.race_diff import RaceDiff
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    race TEXT NOT NULL,
+    taken_at REAL NOT NULL,
+    base_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS snapshots_race ON snapshots (race, taken_at);
+CREATE TABLE IF NOT EXISTS entries (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    name TEXT NOT NULL,
+    rank TEXT,
+    distance TEXT,
+    kills TEXT,
+    removed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_snapshot ON entries (snapshot_id);
+CREATE INDEX IF NOT EXISTS entries_name ON entries (name, snapshot_id);
+"""
+
+class SnapshotStore:
+    def __init__(self, path, rebase_every=100):
+        self.rebase_every = rebase_every
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.latest = {}
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def race_key(race_type, year, identifier):
+        race_type, year, identifier = RaceCache.make_key(race_type, year, identifier)
+        if race_type == "daily":
+            identifier = "/".join(f"{int(part):02d}" if part.isdigit() else part for part in identifier.split('/'))
+        return f"{race_type}/{year}/{identifier}"
+
+    @staticmethod
+    def sort_key(participant):
+        rank = participant['rank']
+        return (0, int(rank), '') if rank.isdigit() else (1, 0, rank)
+
+    def latest_state(self, race):
+        if race not in self.latest:
+            row = self.conn.execute(
+                "SELECT id, COALESCE(base_id, id) FROM snapshots WHERE race = ? ORDER BY id DESC LIMIT 1",
+                (race,)
+            ).fetchone()
+            if row is None:
+                return None
+            deltas = self.conn.execute(
+                "SELECT COUNT(*) FROM snapshots WHERE base_id = ?", (row[1],)
+            ).fetchone()[0]
+            self.latest[race] = (row[1], deltas, self.build(row[1], row[0]))
+        return self.latest[race]
+
+    def add(self, race, participants, taken_at=None):
+        taken_at = time.time() if taken_at is None else taken_at
+        participants = list(participants)
+
+        with self.lock:
+            state = self.latest_state(race)
+            self.conn.execute("BEGIN")
+            try:
+                if state is None or state[1] + 1 >= self.rebase_every:
+                    snapshot_id = self.conn.execute(
+                        "INSERT INTO snapshots (race, taken_at, base_id) VALUES (?, ?, NULL)", (race, taken_at)
+                    ).lastrowid
+                    rows = [(snapshot_id, p['name'], p['rank'], p['distance'], p['kills'], 0) for p in participants]
+                    base_id, deltas = snapshot_id, 0
+                else:
+                    base_id, deltas, previous = state
+                    snapshot_id = self.conn.execute(
+                        "INSERT INTO snapshots (race, taken_at, base_id) VALUES (?, ?, ?)", (race, taken_at, base_id)
+                    ).lastrowid
+                    delta = RaceDiff.diff(previous, participants)
+                    current = RaceDiff.index(participants)
+                    changed = delta['added'] + [current[change['name']] for change in delta['changed']]
+                    rows = [(snapshot_id, p['name'], p['rank'], p['distance'], p['kills'], 0) for p in changed]
+                    rows += [(snapshot_id, name, None, None, None, 1) for name in delta['removed']]
+                    deltas += 1
+
+                self.conn.executemany(
+                    "INSERT INTO entries (snapshot_id, name, rank, distance, kills, removed) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+            self.latest[race] = (base_id, deltas, participants)
+        return snapshot_id
+
+    def build(self, base_id, snapshot_id):
+        players = {}
+        cursor = self.conn.execute(
+            "SELECT name, rank, distance, kills, removed FROM entries "
+            "WHERE snapshot_id BETWEEN ? AND ? AND snapshot_id IN "
+            "(SELECT id FROM snapshots WHERE id = ? OR base_id = ?) "
+            "ORDER BY snapshot_id, rowid",
+            (base_id, snapshot_id, base_id, base_id)
+        )
+        for name, rank, distance, kills, removed in cursor:
+            if removed:
+                players.pop(name, None)
+            else:
+                players[name] = {'rank': rank, 'name': name, 'distance': distance, 'kills': kills}
+        return sorted(players.values(), key=self.sort_key)
+
+    def snapshots(self, race):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT id, taken_at FROM snapshots WHERE race = ? ORDER BY id", (race,)
+            ).fetchall()
+
+    def rebuild(self, race, at=None):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT id, COALESCE(base_id, id), taken_at FROM snapshots "
+                "WHERE race = ? AND taken_at <= ? ORDER BY id DESC LIMIT 1",
+                (race, time.time() if at is None else at)
+            ).fetchone()
+            if row is None:
+                return None, []
+            return row[2], self.build(row[1], row[0])
+
+    def player_history(self, race, name):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT s.id, s.taken_at, s.base_id IS NULL, e.rank, e.removed "
+                "FROM snapshots s LEFT JOIN entries e ON e.snapshot_id = s.id AND e.name = ? "
+                "WHERE s.race = ? AND (s.base_id IS NULL OR e.name IS NOT NULL) "
+                "ORDER BY s.id",
+                (name, race)
+            ).fetchall()
+
+        history = []
+        for _, taken_at, is_base, rank, removed in rows:
+            if removed or (is_base and rank is None):
+                rank = None
+            if not history or history[-1]['rank'] != rank:
+                history.append({'taken_at': taken_at, 'rank': rank})
+        return history
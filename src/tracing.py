@@ -0,0 +1,168 @@
+import asyncio
+import cProfile
+import io
+import logging
+import pstats
+import random
+import sys
+import time
+import uuid
+from collections import OrderedDict
+
+def trace_logger():
+    logger = logging.getLogger("thronebutt.trace")
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+    return logger
+
+class Span:
+    def __init__(self, name, hooks, attrs):
+        self.name = name
+        self.hooks = hooks
+        self.attrs = attrs
+        self.error = None
+        self.started = 0
+        self.duration = 0
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.started
+        if exc is not None:
+            self.error = exc
+        for hook in self.hooks:
+            hook.on_span(self)
+        return False
+
+class NoopSpan:
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+NOOP_SPAN = NoopSpan()
+
+class LogHook:
+    def __init__(self, sample_rate=1.0, sample_rates=None, level=logging.DEBUG):
+        self.sample_rate = sample_rate
+        self.sample_rates = sample_rates or {}
+        self.level = level
+        self.logger = trace_logger()
+        self.last_error = None
+
+    def on_span(self, span):
+        rate = self.sample_rates.get(span.name, self.sample_rate)
+        if span.error is None and rate < 1 and random.random() >= rate:
+            return
+
+        message = " ".join(
+            [span.name, f"{span.duration * 1000:.2f}ms"] +
+            [f"{key}={value}" for key, value in span.attrs.items()]
+        )
+        if span.error is None:
+            self.logger.log(self.level, message)
+        elif span.error is not self.last_error:
+            self.last_error = span.error
+            self.logger.log(
+                self.level, "%s error=%s", message, span.error,
+                exc_info=(type(span.error), span.error, span.error.__traceback__)
+            )
+        else:
+            self.logger.log(self.level, "%s error=%s", message, span.error)
+
+class Tracer:
+    def __init__(self):
+        self.hooks = []
+        self.debug_hooks = [LogHook(sample_rates={'plate': 0.02})]
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    def enabled(self, debug=False):
+        return bool(self.hooks) or debug
+
+    def span(self, name, debug=False, **attrs):
+        if debug:
+            return Span(name, self.hooks + self.debug_hooks, attrs)
+        if self.hooks:
+            return Span(name, self.hooks, attrs)
+        return NOOP_SPAN
+
+class ProfileCapture:
+    def __init__(self, store):
+        self.store = store
+        self.report_id = uuid.uuid4().hex
+        self.profiler = None
+
+    CPROFILE_NOTE = (
+        "cProfile fallback: everything run on the event loop thread during this request is included, "
+        "so concurrent requests may appear. Install pyinstrument for a per-request profile.\n\n"
+    )
+
+    async def __aenter__(self):
+        await self.store.lock.acquire()
+        try:
+            self.start()
+        except BaseException:
+            self.store.lock.release()
+            raise
+        return self
+
+    def start(self):
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        else:
+            self.profiler = Profiler(async_mode="enabled")
+            self.profiler.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            if isinstance(self.profiler, cProfile.Profile):
+                self.profiler.disable()
+                output = io.StringIO()
+                pstats.Stats(self.profiler, stream=output).sort_stats("cumulative").print_stats(50)
+                report = self.CPROFILE_NOTE + output.getvalue()
+            else:
+                self.profiler.stop()
+                report = self.profiler.output_text(unicode=True)
+            self.store.add(self.report_id, report)
+        finally:
+            self.store.lock.release()
+        return False
+
+class ProfileStore:
+    LIMIT = 20
+
+    def __init__(self):
+        self.reports = OrderedDict()
+        self.lock = asyncio.Lock()
+
+    def capture(self):
+        return ProfileCapture(self)
+
+    def add(self, report_id, report):
+        self.reports[report_id] = report
+        while len(self.reports) > self.LIMIT:
+            self.reports.popitem(last=False)
+
+    def get(self, report_id):
+        return self.reports.get(report_id)